@@ -1,60 +1,154 @@
 """Pytest configuration and fixtures for DealBase API tests."""
 
+import asyncio
+from collections import OrderedDict
+from contextvars import ContextVar
+
+import httpx
 import pytest
-from fastapi.testclient import TestClient
+import pytest_asyncio
 from sqlmodel import SQLModel, create_engine, Session
+from sqlalchemy import event
+from sqlalchemy.engine import Connection
+from sqlalchemy.dialects import sqlite
 from sqlalchemy.pool import StaticPool
+from sqlalchemy.schema import CreateIndex, CreateTable
 
 from dealbase_api.main import app
 from dealbase_api.database import get_session
-from dealbase_api.models import *  # Import all models
+from dealbase_api.routers import intake
 from dealbase_api.routers.deals import DealCreate
 
 
-@pytest.fixture(scope="function")
-def test_db():
-    """Create isolated test database for each test."""
-    # Create in-memory SQLite database for testing
+def _compile_schema_script() -> str:
+    """Compile the metadata DDL (tables and indexes) into one SQLite script."""
+    dialect = sqlite.dialect()
+    statements = []
+    for table in SQLModel.metadata.sorted_tables:
+        statements.append(str(CreateTable(table).compile(dialect=dialect)))
+        statements.extend(
+            str(CreateIndex(index).compile(dialect=dialect)) for index in table.indexes
+        )
+    return ";\n".join(statements) + ";"
+
+
+# Every table model registers itself on SQLModel.metadata at import; a model
+# defined twice or imported from a stale module would change this count
+EXPECTED_TABLE_COUNT = 8
+assert len(SQLModel.metadata.tables) == EXPECTED_TABLE_COUNT, (
+    f"Expected {EXPECTED_TABLE_COUNT} tables, found {sorted(SQLModel.metadata.tables)}"
+)
+
+# Compiled once at import so test engines skip SQLAlchemy DDL generation
+SCHEMA_SCRIPT = _compile_schema_script()
+
+
+@pytest.fixture(scope="session")
+def worker_id(request) -> str:
+    """Name of the pytest-xdist worker running this session, or "master"."""
+    return getattr(request.config, "workerinput", {}).get("workerid", "master")
+
+
+@pytest.fixture(scope="session")
+def test_db(worker_id):
+    """Create the in-memory test database once for the whole test session."""
+    # Create a named in-memory SQLite database per xdist worker
     engine = create_engine(
-        "sqlite:///:memory:",
-        connect_args={"check_same_thread": False},
+        f"sqlite:///file:memdb_{worker_id}?mode=memory&cache=shared&uri=true",
+        connect_args={"uri": True, "check_same_thread": False},
         poolclass=StaticPool,
     )
-    
-    # Create all tables
-    SQLModel.metadata.create_all(engine)
-    
+
+    # pysqlite defers BEGIN and mishandles SAVEPOINT; take over transaction
+    # control so nested transactions behave as documented.
+    @event.listens_for(engine, "connect")
+    def _disable_pysqlite_begin(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def _emit_begin(conn):
+        conn.exec_driver_sql("BEGIN")
+
+    # Create all tables with a single executescript of the precompiled DDL
+    raw_connection = engine.raw_connection()
+    try:
+        raw_connection.driver_connection.executescript(SCHEMA_SCRIPT)
+    finally:
+        raw_connection.close()
+
     yield engine
-    
-    # Clean up after test
-    SQLModel.metadata.drop_all(engine)
+
+    engine.dispose()
+
+
+@pytest.fixture(scope="function")
+def test_connection(test_db):
+    """Open a connection wrapped in an outer transaction rolled back per test."""
+    connection = test_db.connect()
+    transaction = connection.begin()
+
+    yield connection
+
+    # Discard everything the test wrote, including committed savepoints
+    transaction.rollback()
+    connection.close()
+
+
+def _savepoint_session(connection) -> Session:
+    """Bind a session to the test connection so its commits become savepoints."""
+    return Session(bind=connection, join_transaction_mode="create_savepoint")
 
 
 @pytest.fixture(scope="function")
-def test_session(test_db):
+def test_session(test_connection):
     """Create database session for testing."""
-    with Session(test_db) as session:
+    with _savepoint_session(test_connection) as session:
         yield session
 
 
-@pytest.fixture(scope="function")
-def test_client(test_db):
-    """Create test client with isolated database."""
-    def get_test_session():
-        with Session(test_db) as session:
-            yield session
-    
-    # Override the database dependency
+# Connection of the currently running test; the session-wide dependency
+# override reads it so one TestClient can serve every test in isolation.
+_current_connection: ContextVar[Connection] = ContextVar("_current_connection")
+
+
+def get_test_session():
+    """Yield a savepoint session bound to the current test's connection."""
+    with _savepoint_session(_current_connection.get()) as session:
+        yield session
+
+
+@pytest.fixture(scope="session")
+def event_loop():
+    """One event loop for the session so the shared client can outlive a test."""
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest_asyncio.fixture(scope="session")
+async def _session_client():
+    """Build the ASGI client and install the dependency override once."""
     app.dependency_overrides[get_session] = get_test_session
-    
-    client = TestClient(app)
-    
-    yield client
-    
-    # Clean up dependency override
+
+    # ASGITransport calls the app in-process: no portal thread, no requests
+    # adapter stack, and no lifespan (so startup never touches the dev DB)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
+
     app.dependency_overrides.clear()
 
 
+@pytest.fixture(scope="function")
+def test_client(_session_client, test_connection):
+    """Create test client with isolated database."""
+    token = _current_connection.set(test_connection)
+
+    yield _session_client
+
+    _current_connection.reset(token)
+
+
 # Test data fixtures
 @pytest.fixture
 def sample_deal_data():
@@ -87,6 +181,18 @@ def sample_t12_data():
     }
 
 
+@pytest.fixture(params=["c", "pyarrow"])
+def csv_engine(request, monkeypatch):
+    """Run a test once per CSV engine; the pyarrow run is skipped when it is not installed."""
+    if request.param == "pyarrow":
+        pytest.importorskip("pyarrow")
+    monkeypatch.setattr(intake, "CSV_ENGINE", request.param)
+    # Parsed uploads are cached by content, so start each engine from an empty cache
+    monkeypatch.setattr(intake, "_parsed_upload_cache", OrderedDict())
+    monkeypatch.setattr(intake, "_parsed_upload_cache_bytes", 0)
+    return request.param
+
+
 @pytest.fixture
 def sample_valuation_request():
     """Sample valuation request for testing."""
@@ -11,6 +11,13 @@ class Settings(BaseSettings):
     """Application settings."""
 
     db_url: str = "sqlite:///./dealbase.sqlite3"
+    db_echo: bool = False  # Log every SQL statement; debugging only
+    db_auto_create: bool = True  # Create missing tables on startup; disable when migrations own the schema
+    # Connection pool sized for the threadpool's concurrent handlers
+    db_pool_size: int = 10
+    db_max_overflow: int = 20
+    db_pool_timeout: int = 30  # Seconds to wait for a free connection
+    db_pool_recycle: int = 1800  # Seconds before a connection is replaced
     port: int = 8000
     log_level: str = "info"
     api_base_url: str = "http://localhost:8000/api"
@@ -1,16 +1,58 @@
 """Database configuration and models."""
 
+from sqlalchemy import event, inspect
+from sqlalchemy.pool import StaticPool
 from sqlmodel import SQLModel, create_engine, Session
 from .config import settings
-from .models import *  # Import all models to register them
+from . import models  # noqa: F401  registers tables on SQLModel.metadata
+
+_is_sqlite = settings.db_url.startswith("sqlite")
+
+# SQLite connections are handed between FastAPI's worker threads; the busy
+# timeout lets writers wait for the lock instead of failing immediately
+connect_args = {"check_same_thread": False, "timeout": 30} if _is_sqlite else {}
+
+# An in-memory database only exists on its one connection; everything else
+# gets a QueuePool sized so concurrent handlers don't queue for connections
+if _is_sqlite and ":memory:" in settings.db_url:
+    pool_args = {"poolclass": StaticPool}
+else:
+    pool_args = {
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+    }
 
 # Create engine
-engine = create_engine(settings.db_url, echo=True)
+engine = create_engine(
+    settings.db_url,
+    echo=settings.db_echo,
+    pool_pre_ping=True,
+    connect_args=connect_args,
+    **pool_args,
+)
+
+
+if _is_sqlite:
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+        """Use WAL so readers don't block the writer, and cache pages in memory."""
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA mmap_size=268435456")
+        cursor.close()
 
 
 def create_db_and_tables() -> None:
     """Create database and tables."""
-    SQLModel.metadata.create_all(engine)
+    # One table listing instead of create_all's per-table existence checks
+    # when the schema is already in place (every boot and autoreload)
+    existing = set(inspect(engine).get_table_names())
+    if not existing.issuperset(SQLModel.metadata.tables):
+        SQLModel.metadata.create_all(engine)
 
 
 def get_session() -> Session:
@@ -1,19 +1,33 @@
 """DealBase FastAPI application."""
 
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, RedirectResponse
+from fastapi.responses import ORJSONResponse, RedirectResponse
 
 from .config import settings
 from .database import engine, create_db_and_tables
 from .routers import deals, health, intake, valuation, export, unit_mix
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Initialize database on startup."""
+    if settings.db_auto_create:
+        create_db_and_tables()
+    yield
+
+
 app = FastAPI(
     title="DealBase API",
     description="Commercial Real Estate Valuation Engine",
     version="1.0.0",
     docs_url="/api/docs",
     redoc_url="/api/redoc",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
 )
 
 # CORS middleware
@@ -23,6 +37,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Total-Count"],  # Pagination totals for list endpoints
 )
 
 # Include routers
@@ -35,9 +50,9 @@ app.include_router(unit_mix.router, prefix="/api", tags=["unit-mix"])
 
 
 @app.get("/")
-async def root():
+async def root() -> ORJSONResponse:
     """Root endpoint with API information and links."""
-    return {
+    return ORJSONResponse({
         "message": "DealBase CRE Valuation Engine API",
         "version": "1.0.0",
         "docs": "/api/docs",
@@ -49,7 +64,7 @@ async def root():
             "valuation": "/api/valuation",
             "export": "/api/export"
         }
-    }
+    })
 
 
 @app.get("/docs")
@@ -58,16 +73,10 @@ async def redirect_docs():
     return RedirectResponse(url="/api/docs")
 
 
-@app.on_event("startup")
-async def startup_event() -> None:
-    """Initialize database on startup."""
-    create_db_and_tables()
-
-
 @app.exception_handler(Exception)
 async def global_exception_handler(request, exc):
     """Global exception handler."""
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
         content={"detail": "Internal server error", "error": str(exc)},
     )
@@ -0,0 +1,17 @@
+"""Database models for DealBase."""
+
+from .deal import AuditEvent, Deal, DealBase, DealDocument
+from .rentroll import RentRollAssumptions, RentRollNormalized, UnitMixSummary
+from .valuation import T12Normalized, ValuationRun
+
+__all__ = [
+    "AuditEvent",
+    "Deal",
+    "DealBase",
+    "DealDocument",
+    "RentRollAssumptions",
+    "RentRollNormalized",
+    "T12Normalized",
+    "UnitMixSummary",
+    "ValuationRun",
+]
@@ -0,0 +1,106 @@
+"""Deal models: the deal itself, its audit trail and uploaded documents."""
+
+from datetime import datetime
+from typing import TYPE_CHECKING, Optional, List, Dict, Any
+from sqlmodel import SQLModel, Field, Relationship
+from sqlalchemy import JSON, Column, Index
+
+if TYPE_CHECKING:
+    from .rentroll import RentRollNormalized
+    from .valuation import T12Normalized, ValuationRun
+
+
+class DealBase(SQLModel):
+    """Base deal model."""
+
+    name: str
+    slug: str = Field(index=True, unique=True)  # URL-friendly identifier
+    property_type: str
+    address: str
+    city: str
+    state: str
+    zip_code: str
+    description: Optional[str] = None
+    status: str = "draft"  # draft, active, completed, archived
+    # Multifamily-specific fields
+    msa: Optional[str] = None  # Metropolitan Statistical Area
+    year_built: Optional[int] = None
+    unit_count: Optional[int] = None  # Number of units
+    nsf: Optional[int] = None  # Net Square Feet (Average Unit SF)
+    deal_tags: Optional[List[str]] = Field(default=None, sa_column=Column(JSON))  # Array of deal tags
+
+
+class Deal(DealBase, table=True):
+    """Deal model."""
+
+    __tablename__ = "deals"
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+
+    # Relationships raise on lazy access so handlers must eager-load
+    # (selectinload) whatever they touch instead of issuing N+1 queries
+    valuation_runs: List["ValuationRun"] = Relationship(back_populates="deal", sa_relationship_kwargs={"lazy": "raise"})
+    t12_data: List["T12Normalized"] = Relationship(back_populates="deal", sa_relationship_kwargs={"lazy": "raise"})
+    rent_roll_data: List["RentRollNormalized"] = Relationship(back_populates="deal", sa_relationship_kwargs={"lazy": "raise"})
+    audit_events: List["AuditEvent"] = Relationship(back_populates="deal", sa_relationship_kwargs={"lazy": "raise"})
+    documents: List["DealDocument"] = Relationship(back_populates="deal", sa_relationship_kwargs={"lazy": "raise"})
+
+
+class AuditEvent(SQLModel, table=True):
+    """Audit event model."""
+
+    __tablename__ = "audit_events"
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    deal_id: int = Field(foreign_key="deals.id", index=True)
+    event_type: str  # created, updated, valuation_run, export, etc.
+    description: str
+    event_metadata: Dict[str, Any] = Field(default_factory=dict, sa_type=JSON)  # JSON field
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
+    # Relationships
+    deal: Optional[Deal] = Relationship(back_populates="audit_events", sa_relationship_kwargs={"lazy": "raise"})
+
+
+class DealDocument(SQLModel, table=True):
+    """Raw documents uploaded for deals."""
+    
+    __tablename__ = "deal_documents"
+    __table_args__ = (
+        # Per-deal lookups by type (rent roll / T-12 listings), newest first
+        Index("ix_deal_documents_deal_type_created", "deal_id", "file_type", "created_at"),
+        # Per-deal document listing ordered by upload time
+        Index("ix_deal_documents_deal_created", "deal_id", "created_at"),
+        # Duplicate-upload check in rent roll intake
+        Index("ix_deal_documents_dedup", "deal_id", "file_hash", "file_type"),
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    deal_id: int = Field(foreign_key="deals.id")  # Indexed by the composite indexes above
+    
+    # Document metadata
+    filename: str = Field(index=True)
+    original_filename: str  # Keep original name for display
+    file_type: str  # 'rent_roll', 't12', etc.
+    file_size: int  # Size in bytes
+    content_type: str  # MIME type
+    
+    # File storage
+    file_path: str  # Path to stored file
+    file_hash: Optional[str] = None  # Deduplication lookups use ix_deal_documents_dedup
+    
+    # Processing status
+    processing_status: str = Field(default="pending", index=True)  # Add index for status queries
+    processing_error: Optional[str] = None
+    processing_started_at: Optional[datetime] = None  # When processing actually began
+    processing_completed_at: Optional[datetime] = None  # When processing finished
+    records_processed: Optional[int] = None  # Number of units processed
+    issues_found: Optional[int] = None  # Number of data quality issues
+    
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    
+    # Relationships
+    deal: Optional[Deal] = Relationship(back_populates="documents", sa_relationship_kwargs={"lazy": "raise"})
@@ -0,0 +1,136 @@
+"""Rent roll models: normalized units, unit mix summaries and assumptions."""
+
+from datetime import datetime
+from decimal import Decimal
+from typing import Optional, Dict
+from sqlmodel import SQLModel, Field, Relationship
+from sqlalchemy import JSON, Index
+
+from .deal import Deal
+
+
+class RentRollNormalized(SQLModel, table=True):
+    """Normalized rent roll data with comprehensive unit information."""
+
+    __tablename__ = "rent_roll_normalized"
+    __table_args__ = (Index("ix_rentroll_deal_unit", "deal_id", "unit_number"),)
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    deal_id: int = Field(foreign_key="deals.id")  # Indexed by ix_rentroll_deal_unit
+    
+    # Core unit identification
+    unit_number: str = Field(index=True)  # e.g., "101", "A-201"
+    unit_label: Optional[str] = None  # e.g., "1BR Premium", "2BR Corner"
+    
+    # Physical characteristics
+    unit_type: str  # e.g., "1BR", "2BR", "Studio"
+    square_feet: Optional[int] = None
+    bedrooms: Optional[int] = None
+    bathrooms: Optional[float] = None
+    
+    # Rent information (actual/in-place rent as primary)
+    rent: Decimal = Field(default=Decimal("0"))  # Legacy rent field for compatibility
+    actual_rent: Decimal = Field(default=Decimal("0"))  # Current rent being paid
+    market_rent: Decimal = Field(default=Decimal("0"))  # Market rate for unit
+    
+    # Lease timing
+    lease_start: Optional[datetime] = None  # Original lease start
+    move_in_date: Optional[datetime] = None  # Actual move-in date
+    lease_expiration: Optional[datetime] = None  # Current lease end
+    
+    # Tenant information
+    tenant_name: Optional[str] = None
+    lease_status: str = Field(default="occupied")  # occupied, vacant, notice_to_vacate
+    
+    # Data quality flags
+    is_duplicate: bool = Field(default=False)  # Flag for duplicate handling
+    is_application: bool = Field(default=False)  # Flag for future applications
+    data_source: str = Field(default="upload")  # upload, manual_entry, import
+    
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+
+    # Relationships
+    deal: Optional[Deal] = Relationship(back_populates="rent_roll_data", sa_relationship_kwargs={"lazy": "raise"})
+
+
+class UnitMixSummary(SQLModel, table=True):
+    """Aggregated unit mix data by unit type with provenance tracking."""
+
+    __tablename__ = "unit_mix_summary"
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    deal_id: int = Field(foreign_key="deals.id", index=True)
+    
+    # Unit type classification
+    unit_type: str = Field(index=True)  # e.g., "1BR", "2BR", "Studio"
+    unit_label: Optional[str] = None  # Custom label for display
+    
+    # Aggregated counts
+    total_units: int = Field(default=0)
+    occupied_units: int = Field(default=0)
+    vacant_units: int = Field(default=0)
+    
+    # Physical characteristics (averages)
+    avg_square_feet: Optional[int] = None
+    avg_bedrooms: Optional[float] = None
+    avg_bathrooms: Optional[float] = None
+    
+    # Rent analysis
+    avg_actual_rent: Decimal = Field(default=Decimal("0"))
+    avg_market_rent: Decimal = Field(default=Decimal("0"))
+    rent_premium: Decimal = Field(default=Decimal("0"))  # actual vs market
+    
+    # Pro forma assumptions (user input)
+    pro_forma_rent: Optional[Decimal] = None  # User-set target rent
+    rent_growth_rate: Optional[Decimal] = None  # Annual growth assumption
+    
+    # Derived metrics
+    total_square_feet: Optional[int] = None
+    total_actual_rent: Decimal = Field(default=Decimal("0"))
+    total_market_rent: Decimal = Field(default=Decimal("0"))
+    total_pro_forma_rent: Decimal = Field(default=Decimal("0"))
+    
+    # Provenance and linking fields
+    provenance: str = Field(default="MANUAL")  # "NRR" | "MANUAL"
+    is_linked_to_nrr: bool = Field(default=False)
+    rent_roll_name: Optional[str] = None  # Name of linked rent roll
+    last_derived_at: Optional[datetime] = None  # When last derived from NRR
+    last_manual_edit_at: Optional[datetime] = None  # When last manually edited
+    
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+
+    # Relationships
+    deal: Optional[Deal] = Relationship(sa_relationship_kwargs={"lazy": "raise"})
+
+
+class RentRollAssumptions(SQLModel, table=True):
+    """User-defined assumptions for rent roll analysis."""
+
+    __tablename__ = "rent_roll_assumptions"
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    deal_id: int = Field(foreign_key="deals.id", index=True)
+    
+    # Pro forma rent assumptions by unit type
+    pro_forma_rents: Dict[str, Decimal] = Field(default_factory=dict, sa_type=JSON)
+    
+    # Market assumptions
+    market_rent_growth: Decimal = Field(default=Decimal("0.03"))  # 3% annual growth
+    vacancy_rate: Decimal = Field(default=Decimal("0.05"))  # 5% vacancy
+    turnover_rate: Decimal = Field(default=Decimal("0.20"))  # 20% annual turnover
+    
+    # Lease assumptions
+    avg_lease_term: int = Field(default=12)  # months
+    lease_renewal_rate: Decimal = Field(default=Decimal("0.70"))  # 70% renewal
+    
+    # Operating assumptions
+    marketing_cost_per_unit: Decimal = Field(default=Decimal("500"))
+    turnover_cost_per_unit: Decimal = Field(default=Decimal("2000"))
+    
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+
+    # Relationships
+    deal: Optional[Deal] = Relationship(sa_relationship_kwargs={"lazy": "raise"})
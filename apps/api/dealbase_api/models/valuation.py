@@ -0,0 +1,47 @@
+"""Valuation models: T-12 operating history and valuation runs."""
+
+from datetime import datetime
+from decimal import Decimal
+from typing import Optional, Dict, Any
+from sqlmodel import SQLModel, Field, Relationship
+from sqlalchemy import JSON
+
+from .deal import Deal
+
+
+class T12Normalized(SQLModel, table=True):
+    """Normalized T-12 data."""
+
+    __tablename__ = "t12_normalized"
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    deal_id: int = Field(foreign_key="deals.id", index=True)
+    month: int
+    year: int
+    gross_rent: Decimal = Field(default=Decimal("0"))
+    other_income: Decimal = Field(default=Decimal("0"))
+    total_income: Decimal = Field(default=Decimal("0"))
+    operating_expenses: Decimal = Field(default=Decimal("0"))
+    net_operating_income: Decimal = Field(default=Decimal("0"))
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
+    # Relationships
+    deal: Optional[Deal] = Relationship(back_populates="t12_data", sa_relationship_kwargs={"lazy": "raise"})
+
+
+class ValuationRun(SQLModel, table=True):
+    """Valuation run model."""
+
+    __tablename__ = "valuation_runs"
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    deal_id: int = Field(foreign_key="deals.id", index=True)
+    name: str
+    status: str = "pending"  # pending, running, completed, failed
+    assumptions: Dict[str, Any] = Field(default_factory=dict, sa_type=JSON)  # JSON field
+    results: Dict[str, Any] = Field(default_factory=dict, sa_type=JSON)  # JSON field with KPIs
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    completed_at: Optional[datetime] = None
+
+    # Relationships
+    deal: Optional[Deal] = Relationship(back_populates="valuation_runs", sa_relationship_kwargs={"lazy": "raise"})
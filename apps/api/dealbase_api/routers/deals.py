@@ -1,16 +1,27 @@
 """Deals router."""
 
-from typing import List, Union, Optional
-from fastapi import APIRouter, Depends, HTTPException
-from sqlmodel import Session, select
+from typing import Iterator, List, Union, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from sqlalchemy.engine import Result
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.sql.expression import ColumnElement
+from sqlmodel import Session, delete, func, select
 from datetime import datetime, timedelta
 from decimal import Decimal
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict, field_serializer
 
 from ..database import get_session
-from ..models import Deal, DealBase, RentRollNormalized, T12Normalized, UnitMixSummary, DealDocument
-from ..utils import create_deal_slug
-
+from ..models import (
+    AuditEvent, Deal, DealBase, DealDocument, RentRollAssumptions, RentRollNormalized,
+    T12Normalized, UnitMixSummary, ValuationRun,
+)
+from ..services.rentroll_parser import normalize_rentroll_document
+from ..utils import as_float, assert_deal_exists, ensure_unique_slug, generate_slug
+
+# Handlers are plain ``def`` so FastAPI runs their blocking Session calls in
+# its threadpool instead of on the event loop.
 router = APIRouter()
 
 
@@ -26,136 +37,257 @@ class LinkRequest(BaseModel):
 
 
 class DealResponse(DealBase):
-    """Deal response schema."""
+    """Deal response schema, validated directly from ORM rows."""
 
     id: int
-    created_at: str
-    updated_at: str
+    created_at: datetime
+    updated_at: datetime
 
+    model_config = ConfigDict(from_attributes=True)
 
-@router.get("/deals", response_model=List[DealResponse])
-async def get_deals(session: Session = Depends(get_session)) -> List[DealResponse]:
-    """Get all deals."""
-    deals = session.exec(select(Deal)).all()
-    return [
-        DealResponse(
-            id=deal.id,
-            name=deal.name,
-            slug=deal.slug,
-            property_type=deal.property_type,
-            address=deal.address,
-            city=deal.city,
-            state=deal.state,
-            zip_code=deal.zip_code,
-            description=deal.description,
-            status=deal.status,
-            created_at=deal.created_at.isoformat(),
-            updated_at=deal.updated_at.isoformat(),
+    @field_serializer("created_at", "updated_at")
+    def serialize_timestamp(self, value: datetime) -> str:
+        """Emit timestamps as ISO 8601 strings."""
+        return value.isoformat()
+
+
+class DealDocumentResponse(BaseModel):
+    """Deal document listing schema, validated directly from ORM rows."""
+
+    id: int
+    filename: str
+    original_filename: str
+    file_type: str
+    file_size: int
+    content_type: str
+    processing_status: str
+    processing_error: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+    @field_serializer("created_at", "updated_at")
+    def serialize_timestamp(self, value: datetime) -> str:
+        """Emit timestamps as ISO 8601 strings."""
+        return value.isoformat()
+
+
+# Rows fetched from the cursor (and serialized) per streamed chunk
+DEALS_STREAM_BATCH_SIZE = 500
+
+# Largest page a list endpoint serves; without a limit the whole list is
+# returned, and the total row count always goes in X-Total-Count
+PAGE_SIZE_MAX = 200
+
+# Plain columns for the deal list, so rows skip ORM instance construction
+# and identity-map bookkeeping on the way to JSON
+DEAL_RESPONSE_COLUMNS = tuple(Deal.__table__.c[name] for name in DealResponse.model_fields)
+
+
+def _stream_deal_rows(rows: Result) -> Iterator[bytes]:
+    """Serialize deal rows into a JSON array one cursor batch at a time."""
+    yield b"["
+    separator = b""
+    for batch in rows.partitions():
+        yield separator + b",".join(
+            DealResponse.model_validate(row).model_dump_json().encode() for row in batch
         )
-        for deal in deals
-    ]
+        separator = b","
+    yield b"]"
 
 
-@router.get("/deals/{deal_identifier}", response_model=DealResponse)
-async def get_deal(deal_identifier: str, session: Session = Depends(get_session)) -> DealResponse:
-    """Get a specific deal by ID or slug."""
-    # Try to parse as integer first (for backward compatibility)
-    try:
-        deal_id = int(deal_identifier)
-        deal = session.get(Deal, deal_id)
-    except ValueError:
-        # Not a number, treat as slug
-        deal = session.exec(select(Deal).where(Deal.slug == deal_identifier)).first()
+def _not_modified(request: Request, etag: str) -> Optional[Response]:
+    """Return a 304 response if the client already holds ``etag``."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and (
+        if_none_match.strip() == "*"
+        or etag in (tag.strip() for tag in if_none_match.split(","))
+    ):
+        return Response(status_code=304, headers={"ETag": etag})
+    return None
+
+
+def _deal_etag(deal: Deal) -> str:
+    """Version a deal by ID and last update; deals change only via updated_at."""
+    return f'"deal-{deal.id}-{deal.updated_at.timestamp()}"'
+
+
+@router.get("/deals", response_model=List[DealResponse])
+def get_deals(
+    request: Request,
+    limit: Optional[int] = Query(None, ge=1, le=PAGE_SIZE_MAX, description="Page size; all deals when omitted"),
+    offset: int = Query(0, ge=0),
+    session: Session = Depends(get_session),
+) -> Response:
+    """Get deals (or one page of them), streamed so memory stays bounded by the batch size."""
+    # Count, newest ID and latest update together version the whole table:
+    # creates bump the max ID, deletes the count, edits the max updated_at
+    total, max_id, last_updated = session.exec(
+        select(func.count(), func.max(Deal.id), func.max(Deal.updated_at)).select_from(Deal)
+    ).one()
+    etag = f'"deals-{total}-{max_id}-{last_updated}"'
+    not_modified = _not_modified(request, etag)
+    if not_modified:
+        return not_modified
     
+    rows = session.exec(
+        select(*DEAL_RESPONSE_COLUMNS)
+        .order_by(Deal.id)
+        .limit(limit)
+        .offset(offset)
+        .execution_options(yield_per=DEALS_STREAM_BATCH_SIZE)
+    )
+    return StreamingResponse(
+        _stream_deal_rows(rows),
+        media_type="application/json",
+        headers={"X-Total-Count": str(total), "ETag": etag},
+    )
+
+
+# Numeric identifiers are matched by the int path converter, so IDs never
+# reach the slug routes and no per-request int() parsing is needed.
+@router.get("/deals/{deal_id:int}", response_model=DealResponse)
+def get_deal(
+    deal_id: int, request: Request, response: Response, session: Session = Depends(get_session)
+) -> Union[DealResponse, Response]:
+    """Get a specific deal by ID."""
+    deal = session.get(Deal, deal_id)
     if not deal:
         raise HTTPException(status_code=404, detail="Deal not found")
     
-    return DealResponse(
-        id=deal.id,
-        name=deal.name,
-        slug=deal.slug,
-        property_type=deal.property_type,
-        address=deal.address,
-        city=deal.city,
-        state=deal.state,
-        zip_code=deal.zip_code,
-        description=deal.description,
-        status=deal.status,
-        created_at=deal.created_at.isoformat(),
-        updated_at=deal.updated_at.isoformat(),
-    )
+    return _conditional_deal_response(deal, request, response)
+
+
+@router.get("/deals/{slug}", response_model=DealResponse)
+def get_deal_by_slug(
+    slug: str, request: Request, response: Response, session: Session = Depends(get_session)
+) -> Union[DealResponse, Response]:
+    """Get a specific deal by slug."""
+    deal = session.exec(select(Deal).where(Deal.slug == slug)).first()
+    if not deal:
+        raise HTTPException(status_code=404, detail="Deal not found")
+    
+    return _conditional_deal_response(deal, request, response)
+
+
+def _conditional_deal_response(
+    deal: Deal, request: Request, response: Response
+) -> Union[DealResponse, Response]:
+    """Serialize a deal with an ETag, or answer 304 if the client has it."""
+    etag = _deal_etag(deal)
+    not_modified = _not_modified(request, etag)
+    if not_modified:
+        return not_modified
+    
+    response.headers["ETag"] = etag
+    return DealResponse.model_validate(deal)
 
 
 @router.post("/deals", response_model=DealResponse)
-async def create_deal(deal_data: DealCreate, session: Session = Depends(get_session)) -> DealResponse:
+def create_deal(deal_data: DealCreate, session: Session = Depends(get_session)) -> DealResponse:
     """Create a new deal."""
-    # Generate slug if not provided
-    if not deal_data.slug:
-        deal_data.slug = create_deal_slug(session, deal_data.name)
+    slug_provided = bool(deal_data.slug)
+    # Generate slug if not provided; the unique index on deals.slug catches
+    # collisions, so the common case is a single INSERT with no probing
+    if not slug_provided:
+        deal_data.slug = generate_slug(deal_data.name)
+    
+    deal = _insert_deal_unless_slug_taken(session, deal_data)
+    if deal is None and not slug_provided:
+        # Generated slug collided: pick the next free suffix and try once more
+        deal_data.slug = ensure_unique_slug(session, deal_data.slug)
+        deal = _insert_deal_unless_slug_taken(session, deal_data)
+    if deal is None:
+        raise HTTPException(status_code=409, detail="A deal with this slug already exists")
     
-    deal = Deal(**deal_data.model_dump())
-    session.add(deal)
+    # Serialize before commit; expire_on_commit would otherwise reload the row
+    response = DealResponse.model_validate(deal)
     session.commit()
-    session.refresh(deal)
     
-    return DealResponse(
-        id=deal.id,
-        name=deal.name,
-        slug=deal.slug,
-        property_type=deal.property_type,
-        address=deal.address,
-        city=deal.city,
-        state=deal.state,
-        zip_code=deal.zip_code,
-        description=deal.description,
-        status=deal.status,
-        created_at=deal.created_at.isoformat(),
-        updated_at=deal.updated_at.isoformat(),
+    return response
+
+
+# Dialect inserts supporting ON CONFLICT, for the databases the app runs on
+_UPSERT_INSERTS = {"sqlite": sqlite_insert, "postgresql": postgresql_insert}
+
+
+def _deal_row(deal: DealCreate) -> dict:
+    """Build the insert row for a new deal."""
+    # DealCreate already carries the field defaults; only the timestamps are
+    # table-side, so stamp them here rather than building a Deal first
+    now = datetime.utcnow()
+    return {**deal.model_dump(), "created_at": now, "updated_at": now}
+
+
+def _insert_deal_unless_slug_taken(session: Session, deal: DealCreate) -> Optional[Deal]:
+    """Insert a deal with ON CONFLICT (slug) DO NOTHING ... RETURNING.
+
+    Returns None when the slug is already taken, without raising or rolling
+    back the transaction.
+    """
+    dialect_insert = _UPSERT_INSERTS[session.get_bind().dialect.name]
+    stmt = (
+        dialect_insert(Deal)
+        .values(_deal_row(deal))
+        .on_conflict_do_nothing(index_elements=[Deal.slug])
+        .returning(Deal)
     )
+    return session.scalars(stmt).first()
 
 
-@router.delete("/deals/{deal_identifier}")
-async def delete_deal(deal_identifier: str, session: Session = Depends(get_session)) -> dict:
-    """Delete a deal and all related data by ID or slug."""
-    # Try to parse as integer first (for backward compatibility)
-    try:
-        deal_id = int(deal_identifier)
-        deal = session.get(Deal, deal_id)
-    except ValueError:
-        # Not a number, treat as slug
-        deal = session.exec(select(Deal).where(Deal.slug == deal_identifier)).first()
-        if deal:
-            deal_id = deal.id
-    
-    if not deal:
-        raise HTTPException(status_code=404, detail="Deal not found")
-    
-    # Delete related data first
-    from ..models import T12Normalized, RentRollNormalized, ValuationRun, AuditEvent
-    
-    # Delete T12 data
-    t12_records = session.exec(select(T12Normalized).where(T12Normalized.deal_id == deal_id)).all()
-    for record in t12_records:
-        session.delete(record)
-    
-    # Delete rent roll data
-    rent_roll_records = session.exec(select(RentRollNormalized).where(RentRollNormalized.deal_id == deal_id)).all()
-    for record in rent_roll_records:
-        session.delete(record)
-    
-    # Delete valuation runs
-    valuation_runs = session.exec(select(ValuationRun).where(ValuationRun.deal_id == deal_id)).all()
-    for run in valuation_runs:
-        session.delete(run)
+def _delete_deal_where(session: Session, condition: ColumnElement[bool]) -> Optional[int]:
+    """Delete the deal matching ``condition`` and all its related data.
+
+    Children are matched with ``deal_id IN (SELECT id FROM deals WHERE ...)``
+    and the deal row is deleted with RETURNING, so no lookup query runs
+    first. Returns the deleted deal's ID, or None if nothing matched.
+    """
+    deal_ids = select(Deal.id).where(condition)
+    child_models = (
+        T12Normalized, RentRollNormalized, ValuationRun, AuditEvent,
+        UnitMixSummary, RentRollAssumptions, DealDocument,
+    )
+    # Nothing in the session outlives the commit below, so skip matching the
+    # deleted rows against the identity map
+    for model in child_models:
+        session.exec(
+            delete(model)
+            .where(model.deal_id.in_(deal_ids))
+            .execution_options(synchronize_session=False)
+        )
     
-    # Delete audit events
-    audit_events = session.exec(select(AuditEvent).where(AuditEvent.deal_id == deal_id)).all()
-    for event in audit_events:
-        session.delete(event)
+    # Finally delete the deal. A bulk DELETE skips the unit of work, which
+    # would otherwise load every relationship collection just to orphan it.
+    deal_id = session.exec(
+        delete(Deal)
+        .where(condition)
+        .returning(Deal.id)
+        .execution_options(synchronize_session=False)
+    ).scalar()
+    if deal_id is None:
+        session.rollback()
+        return None
     
-    # Finally delete the deal
-    session.delete(deal)
     session.commit()
+    return deal_id
+
+
+@router.delete("/deals/{deal_id:int}")
+def delete_deal(deal_id: int, session: Session = Depends(get_session)) -> dict:
+    """Delete a deal and all related data by ID."""
+    if _delete_deal_where(session, Deal.id == deal_id) is None:
+        raise HTTPException(status_code=404, detail="Deal not found")
+    
+    return {"message": "Deal deleted successfully", "id": deal_id}
+
+
+@router.delete("/deals/{slug}")
+def delete_deal_by_slug(slug: str, session: Session = Depends(get_session)) -> dict:
+    """Delete a deal and all related data by slug."""
+    deal_id = _delete_deal_where(session, Deal.slug == slug)
+    if deal_id is None:
+        raise HTTPException(status_code=404, detail="Deal not found")
     
     return {"message": "Deal deleted successfully", "id": deal_id}
 
@@ -222,11 +354,17 @@ class RentRollInfo(BaseModel):
 
 
 @router.get("/deals/{deal_id}/rentroll/available", response_model=List[RentRollInfo])
-async def get_available_rentrolls(deal_id: int, session: Session = Depends(get_session)) -> List[RentRollInfo]:
+def get_available_rentrolls(deal_id: int, session: Session = Depends(get_session)) -> List[RentRollInfo]:
     """Get available rent rolls for a deal."""
-    # Get all rent roll documents for this deal
+    # Get all rent roll documents for this deal, projecting only the listed
+    # columns so wide document rows are never hydrated
     rentrolls = session.exec(
-        select(DealDocument).where(
+        select(
+            DealDocument.id,
+            DealDocument.original_filename,
+            DealDocument.created_at,
+            DealDocument.processing_status,
+        ).where(
             DealDocument.deal_id == deal_id,
             DealDocument.file_type == "rent_roll"
         )
@@ -243,61 +381,101 @@ async def get_available_rentrolls(deal_id: int, session: Session = Depends(get_s
     ]
 
 
+# Returns ORJSONResponse directly: the payload is already JSON-native, so
+# this skips FastAPI's jsonable_encoder walk over every unit row, and orjson
+# serializes dates and datetimes to ISO 8601 itself.
 @router.get("/deals/{deal_id}/rentroll/normalized")
-async def get_normalized_rentroll(deal_id: int, session: Session = Depends(get_session)):
+def get_normalized_rentroll(
+    deal_id: int,
+    summary: bool = Query(False, description="Return only the unit count and source, without unit rows"),
+    session: Session = Depends(get_session),
+) -> ORJSONResponse:
     """Get normalized rent roll data for a deal."""
     # Verify deal exists
-    deal = session.get(Deal, deal_id)
-    if not deal:
-        raise HTTPException(status_code=404, detail="Deal not found")
+    assert_deal_exists(session, deal_id)
     
-    # Get normalized rent roll data
-    rent_roll_data = session.exec(
-        select(RentRollNormalized).where(RentRollNormalized.deal_id == deal_id)
-        .order_by(RentRollNormalized.unit_number)
-    ).all()
+    # The latest completed rent roll document rides along as uncorrelated
+    # scalar subqueries (evaluated once), so its name and timestamp come back
+    # in the same round trip as the units instead of a follow-up query
+    latest_doc = (
+        select(DealDocument.original_filename)
+        .where(
+            DealDocument.deal_id == deal_id,
+            DealDocument.file_type == "rent_roll",
+            DealDocument.processing_status == "completed"
+        )
+        .order_by(DealDocument.created_at.desc())
+        .limit(1)
+    )
+    doc_columns = (
+        latest_doc.scalar_subquery().label("rent_roll_name"),
+        latest_doc.with_only_columns(DealDocument.updated_at).scalar_subquery().label("last_updated"),
+    )
     
-    if not rent_roll_data:
-        return {
+    if summary:
+        # Count in SQL instead of loading every unit just to measure the list
+        nrr_data = []
+        source = session.exec(
+            select(
+                select(func.count()).select_from(RentRollNormalized)
+                .where(RentRollNormalized.deal_id == deal_id)
+                .scalar_subquery().label("total_count"),
+                *doc_columns,
+            )
+        ).one()
+        total_count = source.total_count
+    else:
+        # Get normalized rent roll data as plain rows of just the output columns,
+        # with rents cast to float in SQL (an unset market rent of 0 as NULL)
+        rent_roll_data = session.exec(
+            select(
+                RentRollNormalized.unit_number,
+                RentRollNormalized.unit_label,
+                RentRollNormalized.square_feet,
+                as_float(RentRollNormalized.market_rent, null_if_zero=True),
+                as_float(RentRollNormalized.actual_rent),
+                RentRollNormalized.lease_start,
+                RentRollNormalized.move_in_date,
+                RentRollNormalized.lease_expiration,
+                *doc_columns,
+            ).where(RentRollNormalized.deal_id == deal_id)
+            .order_by(RentRollNormalized.unit_number)
+        ).all()
+        
+        # Convert to response format
+        nrr_data = []
+        for unit in rent_roll_data:
+            nrr_data.append({
+                "unit_number": unit.unit_number,
+                "unit_label": unit.unit_label,
+                "unit_sf": unit.square_feet,
+                "market_rent": unit.market_rent,
+                "actual_rent": unit.actual_rent,
+                "lease_start_date": unit.lease_start,
+                "move_in_date": unit.move_in_date,
+                "lease_expiration_date": unit.lease_expiration
+            })
+        total_count = len(nrr_data)
+        source = rent_roll_data[0] if rent_roll_data else None
+    
+    if not total_count:
+        return ORJSONResponse({
             "data": [],
             "total_count": 0,
             "rent_roll_name": None,
             "last_updated": None
-        }
-    
-    # Get rent roll document info
-    rent_roll_doc = session.exec(
-        select(DealDocument).where(
-            DealDocument.deal_id == deal_id,
-            DealDocument.file_type == "rent_roll",
-            DealDocument.processing_status == "completed"
-        ).order_by(DealDocument.created_at.desc())
-    ).first()
-    
-    # Convert to response format
-    nrr_data = []
-    for unit in rent_roll_data:
-        nrr_data.append({
-            "unit_number": unit.unit_number,
-            "unit_label": unit.unit_label,
-            "unit_sf": unit.square_feet,
-            "market_rent": float(unit.market_rent) if unit.market_rent else None,
-            "actual_rent": float(unit.actual_rent),
-            "lease_start_date": unit.lease_start.isoformat() if unit.lease_start else None,
-            "move_in_date": unit.move_in_date.isoformat() if unit.move_in_date else None,
-            "lease_expiration_date": unit.lease_expiration.isoformat() if unit.lease_expiration else None
         })
     
-    return {
+    return ORJSONResponse({
         "data": nrr_data,
-        "total_count": len(nrr_data),
-        "rent_roll_name": rent_roll_doc.original_filename if rent_roll_doc else None,
-        "last_updated": rent_roll_doc.updated_at.isoformat() if rent_roll_doc else None
-    }
+        "total_count": total_count,
+        "rent_roll_name": source.rent_roll_name,
+        "last_updated": source.last_updated
+    })
 
 
 @router.post("/deals/{deal_id}/rentroll/{rr_id}/normalize")
-async def normalize_rentroll(deal_id: int, rr_id: int, session: Session = Depends(get_session)):
+def normalize_rentroll(deal_id: int, rr_id: int, session: Session = Depends(get_session)):
     """Normalize a rent roll."""
     # Get the rent roll document
     rentroll = session.get(DealDocument, rr_id)
@@ -309,85 +487,59 @@ async def normalize_rentroll(deal_id: int, rr_id: int, session: Session = Depend
         return {"message": "Rent roll already normalized", "normalized": True}
     
     try:
-        # Import the new clean parser
-        from ..services.rentroll_parser import get_rentroll_parser
-        
-        # Create parser instance
-        parser = get_rentroll_parser(session)
-        
-        # Parse the rent roll file
-        file_path = rentroll.file_path
-        result = parser.parse_rentroll(deal_id, file_path)
-        
-        # Persist to database
-        parser.persist_to_database(deal_id, result['normalized_data'])
-        
-        # Mark as completed
-        rentroll.processing_status = "completed"
-        session.add(rentroll)
-        session.commit()
-        
-        return {
-            "message": "Rent roll normalized successfully", 
-            "normalized": True,
-            "records_processed": len(result['normalized_data']),
-            "unit_mix_generated": True,
-            "issues_found": len(result['issues_report']),
-            "validation_passed": len(result['validation_report']['errors']) == 0
-        }
-        
+        outcome = normalize_rentroll_document(session, rentroll)
     except Exception as e:
-        # Mark as failed
-        rentroll.processing_status = "failed"
-        rentroll.processing_error = str(e)
-        session.add(rentroll)
-        session.commit()
-        
         raise HTTPException(status_code=500, detail=f"Failed to normalize rent roll: {str(e)}")
+    
+    return {
+        "message": "Rent roll normalized successfully", 
+        "normalized": True,
+        "records_processed": outcome["records_processed"],
+        "unit_mix_generated": True,
+        "issues_found": outcome["issues_found"],
+        "validation_passed": outcome["validation_passed"]
+    }
 
 
-@router.get("/deals/{deal_id}/documents")
-async def get_deal_documents(deal_id: int, session: Session = Depends(get_session)) -> List[dict]:
-    """Get all documents for a deal."""
+@router.get("/deals/{deal_id}/documents", response_model=List[DealDocumentResponse])
+def get_deal_documents(
+    deal_id: int,
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=PAGE_SIZE_MAX, description="Page size; all documents when omitted"),
+    offset: int = Query(0, ge=0),
+    session: Session = Depends(get_session),
+) -> List[DealDocumentResponse]:
+    """Get a deal's documents (or one page of them), newest first."""
     # Verify deal exists
-    deal = session.get(Deal, deal_id)
-    if not deal:
-        raise HTTPException(status_code=404, detail="Deal not found")
+    assert_deal_exists(session, deal_id)
+    
+    total = session.exec(
+        select(func.count()).select_from(DealDocument).where(DealDocument.deal_id == deal_id)
+    ).one()
+    response.headers["X-Total-Count"] = str(total)
     
-    # Get all documents for this deal
+    # Get the requested documents, selecting only the listed columns;
+    # id breaks created_at ties so pages are stable
     documents = session.exec(
-        select(DealDocument).where(DealDocument.deal_id == deal_id)
-        .order_by(DealDocument.created_at.desc())
+        select(*(getattr(DealDocument, field) for field in DealDocumentResponse.model_fields))
+        .where(DealDocument.deal_id == deal_id)
+        .order_by(DealDocument.created_at.desc(), DealDocument.id.desc())
+        .limit(limit)
+        .offset(offset)
     ).all()
     
-    return [
-        {
-            "id": doc.id,
-            "filename": doc.filename,
-            "original_filename": doc.original_filename,
-            "file_type": doc.file_type,
-            "file_size": doc.file_size,
-            "content_type": doc.content_type,
-            "processing_status": doc.processing_status,
-            "processing_error": doc.processing_error,
-            "created_at": doc.created_at.isoformat(),
-            "updated_at": doc.updated_at.isoformat()
-        }
-        for doc in documents
-    ]
+    return [DealDocumentResponse.model_validate(doc) for doc in documents]
 
 
 @router.post("/deals/{deal_id}/unitmix/link")
-async def link_unitmix_to_rentroll(
+def link_unitmix_to_rentroll(
     deal_id: int,
     link_request: LinkRequest,
     session: Session = Depends(get_session)
 ) -> dict:
     """Link unit mix to specific rent roll and derive from NRR."""
     # Verify deal exists
-    deal = session.get(Deal, deal_id)
-    if not deal:
-        raise HTTPException(status_code=404, detail="Deal not found")
+    assert_deal_exists(session, deal_id)
     
     # Verify rent roll exists and belongs to deal
     rent_roll = session.get(DealDocument, link_request.rrId)
@@ -397,9 +549,7 @@ async def link_unitmix_to_rentroll(
     try:
         # Normalize rent roll if needed
         if rent_roll.processing_status != "completed":
-            # Call the normalization endpoint
-            from . import normalize_rentroll
-            await normalize_rentroll(deal_id, link_request.rrId, session)
+            normalize_rentroll_document(session, rent_roll)
         
         # Derive unit mix from NRR
         from ..routers.unit_mix import derive_unit_mix_from_nrr
@@ -1,19 +1,38 @@
 """Export router."""
 
+from tempfile import SpooledTemporaryFile
+from typing import IO, Iterator
+
 from fastapi import APIRouter, Depends, HTTPException
 from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
 from sqlmodel import Session, select
 import xlsxwriter
-import io
 
 from ..database import get_session
 from ..models import Deal, ValuationRun, T12Normalized, RentRollNormalized
+from ..utils import as_float
 
 router = APIRouter()
 
+# Workbooks up to this size stay in memory; larger ones spill to disk
+XLSX_SPOOL_MAX_SIZE = 8 * 1024 * 1024
+XLSX_STREAM_CHUNK_SIZE = 64 * 1024
+
+
+def _iter_file(file: IO[bytes]) -> Iterator[bytes]:
+    """Yield a file's contents in chunks, closing it once fully sent."""
+    try:
+        while chunk := file.read(XLSX_STREAM_CHUNK_SIZE):
+            yield chunk
+    finally:
+        file.close()
 
+
+# Plain def: FastAPI runs the queries and the CPU-bound workbook build in its
+# threadpool instead of stalling the event loop.
 @router.get("/export/xlsx/{deal_id}")
-async def export_deal_xlsx(
+def export_deal_xlsx(
     deal_id: int,
     session: Session = Depends(get_session)
 ) -> StreamingResponse:
@@ -23,92 +42,128 @@ async def export_deal_xlsx(
     if not deal:
         raise HTTPException(status_code=404, detail="Deal not found")
     
+    # The three sheet queries share this request's session and connection, so
+    # rather than fanning them out, each selects only the columns it exports
+    # and skips ORM entity construction
+    
     # Get valuation runs
     valuation_runs = session.exec(
-        select(ValuationRun).where(ValuationRun.deal_id == deal_id)
+        select(ValuationRun.name, ValuationRun.results).where(ValuationRun.deal_id == deal_id)
     ).all()
     
     # Get T-12 data
     t12_data = session.exec(
-        select(T12Normalized).where(T12Normalized.deal_id == deal_id)
+        select(
+            T12Normalized.month,
+            T12Normalized.year,
+            as_float(T12Normalized.gross_rent),
+            as_float(T12Normalized.other_income),
+            as_float(T12Normalized.total_income),
+            as_float(T12Normalized.operating_expenses),
+            as_float(T12Normalized.net_operating_income),
+        ).where(T12Normalized.deal_id == deal_id)
     ).all()
     
     # Get rent roll data
     rent_roll_data = session.exec(
-        select(RentRollNormalized).where(RentRollNormalized.deal_id == deal_id)
+        select(
+            RentRollNormalized.unit_number,
+            RentRollNormalized.unit_type,
+            RentRollNormalized.square_feet,
+            RentRollNormalized.bedrooms,
+            RentRollNormalized.bathrooms,
+            as_float(RentRollNormalized.rent),
+            as_float(RentRollNormalized.market_rent),
+            RentRollNormalized.tenant_name,
+        ).where(RentRollNormalized.deal_id == deal_id)
     ).all()
     
-    # Create Excel file in memory
-    output = io.BytesIO()
-    workbook = xlsxwriter.Workbook(output)
+    # constant_memory flushes each row as soon as the next one starts, so
+    # sheets must be written top to bottom
+    output = SpooledTemporaryFile(max_size=XLSX_SPOOL_MAX_SIZE)
+    workbook = xlsxwriter.Workbook(output, {"constant_memory": True, "in_memory": False})
     
     # Deal Summary Sheet
     summary_sheet = workbook.add_worksheet("Deal Summary")
-    summary_sheet.write(0, 0, "Deal Name")
-    summary_sheet.write(0, 1, deal.name)
-    summary_sheet.write(1, 0, "Property Type")
-    summary_sheet.write(1, 1, deal.property_type)
-    summary_sheet.write(2, 0, "Address")
-    summary_sheet.write(2, 1, f"{deal.address}, {deal.city}, {deal.state} {deal.zip_code}")
-    summary_sheet.write(3, 0, "Status")
-    summary_sheet.write(3, 1, deal.status)
+    summary_rows = [
+        ("Deal Name", deal.name),
+        ("Property Type", deal.property_type),
+        ("Address", f"{deal.address}, {deal.city}, {deal.state} {deal.zip_code}"),
+        ("Status", deal.status),
+    ]
+    for row, values in enumerate(summary_rows):
+        summary_sheet.write_row(row, 0, values)
     
     # Valuation Results Sheet
     if valuation_runs:
         valuation_sheet = workbook.add_worksheet("Valuation Results")
-        headers = ["Run Name", "IRR", "Equity Multiple", "DSCR", "EGI", "NOI", "Cap Rate", "LTV"]
-        for col, header in enumerate(headers):
-            valuation_sheet.write(0, col, header)
+        valuation_sheet.write_row(0, 0, ["Run Name", "IRR", "Equity Multiple", "DSCR", "EGI", "NOI", "Cap Rate", "LTV"])
         
         for row, run in enumerate(valuation_runs, 1):
             if run.results:
-                valuation_sheet.write(row, 0, run.name)
-                valuation_sheet.write(row, 1, run.results.get("irr", 0))
-                valuation_sheet.write(row, 2, run.results.get("equity_multiple", 0))
-                valuation_sheet.write(row, 3, run.results.get("dscr", 0))
-                valuation_sheet.write(row, 4, run.results.get("egi", 0))
-                valuation_sheet.write(row, 5, run.results.get("noi", 0))
-                valuation_sheet.write(row, 6, run.results.get("cap_rate", 0))
-                valuation_sheet.write(row, 7, run.results.get("ltv", 0))
+                results = run.results
+                valuation_sheet.write_row(row, 0, (
+                    run.name,
+                    results.get("irr", 0),
+                    results.get("equity_multiple", 0),
+                    results.get("dscr", 0),
+                    results.get("egi", 0),
+                    results.get("noi", 0),
+                    results.get("cap_rate", 0),
+                    results.get("ltv", 0),
+                ))
     
     # T-12 Data Sheet
     if t12_data:
         t12_sheet = workbook.add_worksheet("T-12 Data")
-        headers = ["Month", "Year", "Gross Rent", "Other Income", "Total Income", "Operating Expenses", "NOI"]
-        for col, header in enumerate(headers):
-            t12_sheet.write(0, col, header)
+        t12_sheet.write_row(0, 0, ["Month", "Year", "Gross Rent", "Other Income", "Total Income", "Operating Expenses", "NOI"])
         
+        # Every T-12 column is numeric, so call write_number directly rather
+        # than letting write()/write_row() type-dispatch each cell
+        write_number = t12_sheet.write_number
         for row, month in enumerate(t12_data, 1):
-            t12_sheet.write(row, 0, month.month)
-            t12_sheet.write(row, 1, month.year)
-            t12_sheet.write(row, 2, float(month.gross_rent))
-            t12_sheet.write(row, 3, float(month.other_income))
-            t12_sheet.write(row, 4, float(month.total_income))
-            t12_sheet.write(row, 5, float(month.operating_expenses))
-            t12_sheet.write(row, 6, float(month.net_operating_income))
+            for col, value in enumerate((
+                month.month,
+                month.year,
+                month.gross_rent,
+                month.other_income,
+                month.total_income,
+                month.operating_expenses,
+                month.net_operating_income,
+            )):
+                write_number(row, col, value)
     
     # Rent Roll Sheet
     if rent_roll_data:
         rent_roll_sheet = workbook.add_worksheet("Rent Roll")
-        headers = ["Unit Number", "Unit Type", "Square Feet", "Bedrooms", "Bathrooms", "Rent", "Market Rent", "Tenant Name"]
-        for col, header in enumerate(headers):
-            rent_roll_sheet.write(0, col, header)
+        rent_roll_sheet.write_row(0, 0, ["Unit Number", "Unit Type", "Square Feet", "Bedrooms", "Bathrooms", "Rent", "Market Rent", "Tenant Name"])
         
+        # Column types are fixed, so dispatch once per column; missing optional
+        # values are left as empty cells (an unformatted blank writes nothing)
+        write_string = rent_roll_sheet.write_string
+        write_number = rent_roll_sheet.write_number
         for row, unit in enumerate(rent_roll_data, 1):
-            rent_roll_sheet.write(row, 0, unit.unit_number)
-            rent_roll_sheet.write(row, 1, unit.unit_type)
-            rent_roll_sheet.write(row, 2, unit.square_feet or "")
-            rent_roll_sheet.write(row, 3, unit.bedrooms or "")
-            rent_roll_sheet.write(row, 4, unit.bathrooms or "")
-            rent_roll_sheet.write(row, 5, float(unit.rent))
-            rent_roll_sheet.write(row, 6, float(unit.market_rent) if unit.market_rent else "")
-            rent_roll_sheet.write(row, 7, unit.tenant_name or "")
+            write_string(row, 0, unit.unit_number)
+            write_string(row, 1, unit.unit_type)
+            if unit.square_feet:
+                write_number(row, 2, unit.square_feet)
+            if unit.bedrooms:
+                write_number(row, 3, unit.bedrooms)
+            if unit.bathrooms:
+                write_number(row, 4, unit.bathrooms)
+            write_number(row, 5, unit.rent)
+            if unit.market_rent:
+                write_number(row, 6, unit.market_rent)
+            if unit.tenant_name:
+                write_string(row, 7, unit.tenant_name)
     
     workbook.close()
     output.seek(0)
     
     return StreamingResponse(
-        io.BytesIO(output.read()),
+        _iter_file(output),
         media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        headers={"Content-Disposition": f"attachment; filename=deal_{deal_id}_export.xlsx"}
+        headers={"Content-Disposition": f"attachment; filename=deal_{deal_id}_export.xlsx"},
+        # Release the spooled file even if the client disconnects mid-download
+        background=BackgroundTask(output.close),
     )
@@ -1,10 +1,20 @@
 """Health check router."""
 
-from fastapi import APIRouter
+import time
+from datetime import datetime
+from typing import Optional, Tuple
+
+from fastapi import APIRouter, Response
 from pydantic import BaseModel
 
 router = APIRouter()
 
+# Liveness probes poll constantly; serve the same rendered body for this long
+HEALTH_CACHE_TTL_SECONDS = 1
+
+# (monotonic expiry, rendered JSON body)
+_health_cache: Optional[Tuple[float, bytes]] = None
+
 
 class HealthResponse(BaseModel):
     """Health check response."""
@@ -15,12 +25,21 @@ class HealthResponse(BaseModel):
 
 
 @router.get("/health", response_model=HealthResponse)
-async def health_check() -> HealthResponse:
+async def health_check() -> Response:
     """Health check endpoint."""
-    from datetime import datetime
-
-    return HealthResponse(
-        status="healthy",
-        timestamp=datetime.utcnow().isoformat(),
-        version="1.0.0",
+    global _health_cache
+
+    now = time.monotonic()
+    if _health_cache is None or now >= _health_cache[0]:
+        body = HealthResponse(
+            status="healthy",
+            timestamp=datetime.utcnow().isoformat(),
+            version="1.0.0",
+        ).model_dump_json().encode()
+        _health_cache = (now + HEALTH_CACHE_TTL_SECONDS, body)
+
+    return Response(
+        content=_health_cache[1],
+        media_type="application/json",
+        headers={"Cache-Control": f"public, max-age={HEALTH_CACHE_TTL_SECONDS}"},
     )
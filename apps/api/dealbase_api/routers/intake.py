@@ -1,149 +1,366 @@
 """Data intake router."""
 
-from typing import List, Dict, Any
+from collections import OrderedDict
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Tuple
 from decimal import Decimal
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
-from sqlmodel import Session, select
+from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile, File
+from fastapi.responses import StreamingResponse
+from openpyxl import load_workbook
+from sqlalchemy.engine import Result
+from sqlalchemy.exc import OperationalError
+from sqlmodel import Session, delete, func, insert, select
 from pydantic import BaseModel
 import pandas as pd
 import numpy as np
-import io
+import orjson
+import csv
 import os
 import hashlib
+import importlib.util
+import logging
+import random
+import secrets
+import threading
+import time
 from pathlib import Path
 from datetime import datetime
 
 from ..database import get_session
-from ..models import Deal, T12Normalized, RentRollNormalized, UnitMixSummary, RentRollAssumptions, DealDocument
+from ..models import T12Normalized, RentRollNormalized, UnitMixSummary, RentRollAssumptions, DealDocument
+from ..services.rentroll_normalization import get_rentroll_normalizer
+from ..services.rentroll_parser import get_rentroll_parser
+from ..utils import as_float, assert_deal_exists
 
+logger = logging.getLogger(__name__)
+
+# Handlers are plain ``def`` so FastAPI runs their blocking Session calls in
+# its threadpool instead of on the event loop.
 router = APIRouter()
 
+# T-12 columns stored as Decimal amounts
+T12_AMOUNT_COLUMNS = (
+    "gross_rent",
+    "other_income",
+    "total_income",
+    "operating_expenses",
+    "net_operating_income",
+)
 
-def save_document(deal_id: int, file: UploadFile, file_type: str, session: Session) -> DealDocument:
-    """Save uploaded file and create document record."""
-    
-    # Create uploads directory if it doesn't exist
-    uploads_dir = Path(__file__).parent.parent / "uploads"
-    uploads_dir.mkdir(exist_ok=True)
-    
-    # Generate unique filename
-    file_extension = Path(file.filename).suffix if file.filename else ""
-    filename = f"deal_{deal_id}_{file_type}_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}{file_extension}"
-    file_path = uploads_dir / filename
-    
-    # Read file content and calculate hash
-    content = file.file.read()
-    file_hash = hashlib.md5(content).hexdigest()
-    
-    # Save file to disk
-    with open(file_path, "wb") as f:
-        f.write(content)
-    
-    # Check for existing documents of this type for this deal
-    existing_docs = session.exec(
-        select(DealDocument).where(
-            DealDocument.deal_id == deal_id,
-            DealDocument.file_type == file_type
-        )
-    ).all()
-    
-    # If there are existing documents, we'll keep them and add the new one
-    # The user can manage duplicates through the UI
-    if existing_docs:
-        print(f"DEBUG: Found {len(existing_docs)} existing {file_type} documents for deal {deal_id}. Adding new document without deleting existing ones.")
-    
-    # Create new document record
-    document = DealDocument(
-        deal_id=deal_id,
-        filename=filename,
-        original_filename=file.filename or f"uploaded_file{file_extension}",
-        file_type=file_type,
-        file_size=len(content),
-        content_type=file.content_type or "application/octet-stream",
-        file_path=str(file_path),
-        file_hash=file_hash,
-        processing_status="pending"
+
+def _to_decimal(value: Any) -> Decimal:
+    """Convert a JSON number to Decimal via its string form, avoiding float artifacts."""
+    return Decimal(str(value))
+
+
+# Scalar rent roll assumptions accepted by the update endpoint, with converters
+RENTROLL_ASSUMPTION_FIELDS = (
+    ("market_rent_growth", _to_decimal),
+    ("vacancy_rate", _to_decimal),
+    ("turnover_rate", _to_decimal),
+    ("avg_lease_term", int),
+    ("lease_renewal_rate", _to_decimal),
+    ("marketing_cost_per_unit", _to_decimal),
+    ("turnover_cost_per_unit", _to_decimal),
+)
+
+
+def _assumptions_payload(deal_id: int, assumptions: RentRollAssumptions) -> Dict[str, Any]:
+    """Render rent roll assumptions for the API, with Decimals as floats."""
+    return {
+        "deal_id": deal_id,
+        "pro_forma_rents": {k: float(v) for k, v in assumptions.pro_forma_rents.items()},
+        "market_rent_growth": float(assumptions.market_rent_growth),
+        "vacancy_rate": float(assumptions.vacancy_rate),
+        "turnover_rate": float(assumptions.turnover_rate),
+        "avg_lease_term": assumptions.avg_lease_term,
+        "lease_renewal_rate": float(assumptions.lease_renewal_rate),
+        "marketing_cost_per_unit": float(assumptions.marketing_cost_per_unit),
+        "turnover_cost_per_unit": float(assumptions.turnover_cost_per_unit),
+        "created_at": assumptions.created_at.isoformat(),
+        "updated_at": assumptions.updated_at.isoformat()
+    }
+
+
+# Uploaded documents are stored here; created once at import
+UPLOADS_DIR = Path(__file__).resolve().parent.parent / "uploads"
+UPLOADS_DIR.mkdir(exist_ok=True)
+
+# Uploads are copied to disk, and hashed, in chunks of this size
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+# pyarrow's multithreaded CSV reader when it is installed, else pandas' C parser
+CSV_ENGINE = "pyarrow" if importlib.util.find_spec("pyarrow") else "c"
+
+# Rent roll rows fetched from the cursor (and serialized) per streamed chunk
+RENTROLL_STREAM_BATCH_SIZE = 500
+
+# Transient failures worth retrying; parse and validation errors are deterministic
+RETRYABLE_ERRORS = (OSError, OperationalError)
+
+# Rows returned by the raw rent roll preview
+RAW_PREVIEW_ROWS = 20
+
+# Rows scanned when looking for the header row of an Excel upload
+EXCEL_HEADER_PROBE_ROWS = 15
+
+# Parsed uploads kept in memory, keyed on (content hash, suffix, header
+# threshold), with their total in-memory size held under this many bytes
+PARSED_UPLOAD_CACHE_BYTES = 64 * 1024 * 1024
+
+# Entries are (DataFrame, its deep memory usage), least recently used first
+_parsed_upload_cache: "OrderedDict[Tuple[str, str, int], Tuple[pd.DataFrame, int]]" = OrderedDict()
+_parsed_upload_cache_bytes = 0
+_parsed_upload_lock = threading.Lock()
+
+
+def _content_hasher() -> "hashlib.blake2b":
+    """Return the hasher used to fingerprint uploads for deduplication.
+
+    The digest only has to tell repeat uploads apart, so a 128-bit BLAKE2b
+    (built in, and much cheaper than sha256) is enough.
+    """
+    return hashlib.blake2b(digest_size=16)
+
+
+def _is_meaningful_header(value: Any) -> bool:
+    """Return True if a cell looks like a real column name."""
+    value_str = str(value).strip()
+    return (
+        not value_str.startswith('Unnamed:')
+        and value_str not in ['', 'nan', 'NaN', 'None']
+        and len(value_str) > 1
     )
-    
-    session.add(document)
-    session.commit()
-    session.refresh(document)
-    
-    return document
 
-def save_document_with_content(deal_id: int, file: UploadFile, content: bytes, file_type: str, session: Session) -> DealDocument:
-    """Save uploaded file with provided content and create document record."""
-    
-    # Create uploads directory if it doesn't exist
-    uploads_dir = Path(__file__).parent.parent / "uploads"
-    uploads_dir.mkdir(exist_ok=True)
-    
-    # Generate unique filename
+
+def _upload_suffix(filename: Optional[str]) -> str:
+    """Return the lower-cased extension used to pick a reader for an upload."""
+    return Path(filename or "").suffix.lower()
+
+
+def _read_csv_upload(source: BinaryIO, suffix: str, min_meaningful_columns: int) -> pd.DataFrame:
+    """Read a CSV upload; the header is always the first row."""
+    try:
+        df = pd.read_csv(source, engine=CSV_ENGINE)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Failed to read CSV file: {str(e)}")
+
+    # pyarrow keeps text columns that are not valid UTF-8 as raw bytes where the
+    # C parser raises, so reject them the same way
+    for column in df.select_dtypes(include=object).columns:
+        first = df[column].first_valid_index()
+        if first is not None and isinstance(df[column][first], bytes):
+            raise HTTPException(status_code=400, detail="Failed to read CSV file: not valid UTF-8")
+    return df
+
+
+def _read_excel_smart(source: BinaryIO, suffix: str, min_meaningful_columns: int) -> pd.DataFrame:
+    """Read an Excel upload, detecting the header row from a single probe read.
+
+    The first rows are read once without a header and scored in memory; the
+    sheet is then parsed a single time using the first row with at least
+    ``min_meaningful_columns`` usable column names.
+    """
+    engine = 'openpyxl' if suffix == '.xlsx' else 'xlrd'
+
+    probe = pd.read_excel(source, header=None, nrows=EXCEL_HEADER_PROBE_ROWS, engine=engine)
+
+    header_row = 0
+    for row_num, row in enumerate(probe.itertuples(index=False, name=None)):
+        if sum(1 for value in row if _is_meaningful_header(value)) >= min_meaningful_columns:
+            header_row = row_num
+            break
+
+    source.seek(0)
+    return pd.read_excel(source, header=header_row, engine=engine)
+
+
+# Upload readers keyed on file extension
+_UPLOAD_READERS = {
+    ".csv": _read_csv_upload,
+    ".xlsx": _read_excel_smart,
+    ".xls": _read_excel_smart,
+}
+
+
+def _read_upload(source: BinaryIO, suffix: str, min_meaningful_columns: int) -> pd.DataFrame:
+    """Parse an uploaded CSV or Excel file, read from the start of ``source``, into a DataFrame."""
+    reader = _UPLOAD_READERS.get(suffix)
+    if reader is None:
+        raise HTTPException(status_code=400, detail="Unsupported file format")
+    source.seek(0)
+    return reader(source, suffix, min_meaningful_columns)
+
+
+def _cache_parsed_upload(key: Tuple[str, str, int], df: pd.DataFrame) -> None:
+    """Cache a parsed upload, evicting the least recently used entries to stay in budget.
+
+    A frame larger than the whole budget is not cached at all.
+    """
+    global _parsed_upload_cache_bytes
+    nbytes = int(df.memory_usage(deep=True).sum())
+    if nbytes > PARSED_UPLOAD_CACHE_BYTES:
+        return
+    with _parsed_upload_lock:
+        previous = _parsed_upload_cache.pop(key, None)
+        if previous is not None:
+            _parsed_upload_cache_bytes -= previous[1]
+        _parsed_upload_cache[key] = (df, nbytes)
+        _parsed_upload_cache_bytes += nbytes
+        while _parsed_upload_cache_bytes > PARSED_UPLOAD_CACHE_BYTES:
+            _, (_, evicted_bytes) = _parsed_upload_cache.popitem(last=False)
+            _parsed_upload_cache_bytes -= evicted_bytes
+
+
+def _parse_upload(source: BinaryIO, filename: str, min_meaningful_columns: int) -> pd.DataFrame:
+    """Parse an upload, reusing the DataFrame from an earlier identical upload.
+
+    ``source`` is the upload's own spooled file; it is hashed and parsed in
+    place rather than first copied into a bytes object. Entries are keyed on
+    the content hash and the header threshold, so sending the same file to
+    the same endpoint again (repeated T-12 intakes or rent roll previews)
+    skips the parse. Rent roll uploads go through the rent roll parser and
+    do not use this cache. Callers get a copy and may modify it freely.
+    """
+    suffix = _upload_suffix(filename)
+    hasher = _content_hasher()
+    source.seek(0)
+    while chunk := source.read(UPLOAD_CHUNK_SIZE):
+        hasher.update(chunk)
+    key = (hasher.hexdigest(), suffix, min_meaningful_columns)
+
+    with _parsed_upload_lock:
+        entry = _parsed_upload_cache.get(key)
+        if entry is not None:
+            _parsed_upload_cache.move_to_end(key)
+
+    if entry is None:
+        df = _read_upload(source, suffix, min_meaningful_columns)
+        _cache_parsed_upload(key, df)
+    else:
+        df = entry[0]
+
+    return df.copy()
+
+
+def _retry_delay(attempt: int) -> float:
+    """Seconds to wait before retry ``attempt`` (0 for the first retry).
+
+    Capped exponential backoff plus jitter: 1s, 2s, 4s, ... up to 8s.
+    """
+    return min(8.0, 2.0 ** attempt) + random.uniform(0, 0.5)
+
+
+def _read_csv_head(file_path: str, nrows: int) -> pd.DataFrame:
+    """Read the header and first ``nrows`` rows of a saved CSV.
+
+    pandas' pyarrow engine does not take ``nrows``, so with pyarrow the file
+    is read a block at a time through its streaming reader, stopping once
+    enough rows are in; otherwise pandas' C parser reads with ``nrows``.
+    """
+    if CSV_ENGINE != "pyarrow":
+        return pd.read_csv(file_path, nrows=nrows)
+
+    import pyarrow as pa
+    from pyarrow import csv as pa_csv
+
+    # Empty cells come back as nulls, as they do from pandas
+    convert_options = pa_csv.ConvertOptions(strings_can_be_null=True)
+    batches = []
+    rows = 0
+    with pa_csv.open_csv(file_path, convert_options=convert_options) as reader:
+        for batch in reader:
+            batches.append(batch)
+            rows += batch.num_rows
+            if rows >= nrows:
+                break
+        table = pa.Table.from_batches(batches, schema=reader.schema).slice(0, nrows)
+
+    # pyarrow keeps text that is not valid UTF-8 as binary where the C parser raises
+    if any(pa.types.is_binary(field.type) for field in table.schema):
+        raise ValueError("not valid UTF-8")
+    return table.to_pandas()
+
+
+def _count_data_rows(file_path: str, suffix: str) -> int:
+    """Count the rows below the header of a saved upload without parsing it into a DataFrame.
+
+    Mirrors pandas: blank CSV lines are skipped and trailing empty sheet rows
+    are ignored.
+    """
+    if suffix == '.csv':
+        with open(file_path, newline='', encoding='utf-8', errors='replace') as f:
+            return max(sum(1 for row in csv.reader(f) if row) - 1, 0)
+    if suffix != '.xlsx':
+        return len(pd.read_excel(file_path, engine='xlrd'))
+
+    workbook = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        last_row = 0
+        for row_num, row in enumerate(workbook.worksheets[0].iter_rows(values_only=True), start=1):
+            if any(value is not None for value in row):
+                last_row = row_num
+        return max(last_row - 1, 0)
+    finally:
+        workbook.close()
+
+
+def _document_path(deal_id: int, file: UploadFile, file_type: str) -> Path:
+    """Build a unique path under the uploads directory for a new document.
+
+    The random suffix keeps uploads landing in the same second (such as a
+    duplicate that is about to be discarded) from sharing a path.
+    """
     file_extension = Path(file.filename).suffix if file.filename else ""
-    filename = f"deal_{deal_id}_{file_type}_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}{file_extension}"
-    file_path = uploads_dir / filename
-    
-    # Calculate hash from provided content
-    file_hash = hashlib.md5(content).hexdigest()
-    
-    # Save file to disk
+    timestamp = datetime.utcnow().strftime('%Y%m%d_%H%M%S')
+    filename = f"deal_{deal_id}_{file_type}_{timestamp}_{secrets.token_hex(4)}{file_extension}"
+    return UPLOADS_DIR / filename
+
+
+def _write_upload(file: UploadFile, file_path: Path, max_size: Optional[int] = None) -> Tuple[str, int]:
+    """Stream an upload to ``file_path`` in fixed-size chunks.
+
+    Returns the content hash (see ``_content_hasher``) and size of what was
+    written. When the running size passes ``max_size`` the partial file is
+    removed and a 400 is raised without reading the rest of the upload.
+    """
+    hasher = _content_hasher()
+    file_size = 0
     with open(file_path, "wb") as f:
-        f.write(content)
-    
-    # Check for existing documents of this type for this deal
-    existing_docs = session.exec(
-        select(DealDocument).where(
-            DealDocument.deal_id == deal_id,
-            DealDocument.file_type == file_type
-        )
-    ).all()
-    
-    # If there are existing documents, we'll keep them and add the new one
-    # The user can manage duplicates through the UI
-    if existing_docs:
-        print(f"DEBUG: Found {len(existing_docs)} existing {file_type} documents for deal {deal_id}. Adding new document without deleting existing ones.")
-    
-    # Create new document record
-    document = DealDocument(
-        deal_id=deal_id,
-        filename=filename,
-        original_filename=file.filename or f"uploaded_file{file_extension}",
-        file_type=file_type,
-        file_size=len(content),
-        content_type=file.content_type or "application/octet-stream",
-        file_path=str(file_path),
-        file_hash=file_hash,
-        processing_status="pending"
-    )
-    
-    session.add(document)
-    session.commit()
-    session.refresh(document)
-    
-    return document
-    
-    # Clear existing documents of this type for this deal
-    existing_docs = session.exec(
-        select(DealDocument).where(
-            DealDocument.deal_id == deal_id,
-            DealDocument.file_type == file_type
-        )
-    ).all()
-    
-    for doc in existing_docs:
-        # Delete the old file
-        old_file_path = Path(doc.file_path)
-        if old_file_path.exists():
-            old_file_path.unlink()
-        session.delete(doc)
+        while chunk := file.file.read(UPLOAD_CHUNK_SIZE):
+            file_size += len(chunk)
+            if max_size is not None and file_size > max_size:
+                f.close()
+                file_path.unlink(missing_ok=True)
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"File too large. Maximum size: {max_size // (1024*1024)}MB"
+                )
+            hasher.update(chunk)
+            f.write(chunk)
+    return hasher.hexdigest(), file_size
+
+
+def _create_document(
+    deal_id: int,
+    file: UploadFile,
+    file_type: str,
+    file_path: Path,
+    file_hash: str,
+    file_size: int,
+    session: Session,
+) -> DealDocument:
+    """Create the document record for an upload already written to disk.
+
+    Earlier documents of the same type are kept; the user can manage
+    duplicates through the UI.
+    """
     
-    # Create new document record
     document = DealDocument(
         deal_id=deal_id,
-        filename=filename,
-        original_filename=file.filename or f"uploaded_file{file_extension}",
+        filename=file_path.name,
+        original_filename=file.filename or f"uploaded_file{file_path.suffix}",
         file_type=file_type,
-        file_size=len(content),
+        file_size=file_size,
         content_type=file.content_type or "application/octet-stream",
         file_path=str(file_path),
         file_hash=file_hash,
@@ -157,6 +374,13 @@ def save_document_with_content(deal_id: int, file: UploadFile, content: bytes, f
     return document
 
 
+def save_document(deal_id: int, file: UploadFile, file_type: str, session: Session) -> DealDocument:
+    """Save uploaded file and create document record."""
+    file_path = _document_path(deal_id, file, file_type)
+    file_hash, file_size = _write_upload(file, file_path)
+    return _create_document(deal_id, file, file_type, file_path, file_hash, file_size, session)
+
+
 class IntakeResponse(BaseModel):
     """Intake response schema."""
 
@@ -167,78 +391,16 @@ class IntakeResponse(BaseModel):
 
 
 @router.post("/intake/t12/{deal_id}")
-async def intake_t12(
+def intake_t12(
     deal_id: int,
     file: UploadFile = File(...),
     session: Session = Depends(get_session)
 ) -> IntakeResponse:
     """Intake T-12 data from CSV/Excel file."""
     # Verify deal exists
-    deal = session.get(Deal, deal_id)
-    if not deal:
-        raise HTTPException(status_code=404, detail="Deal not found")
-    
-    # Read file content
-    content = await file.read()
-    
-    # Parse based on file extension
-    if file.filename.endswith('.csv'):
-        try:
-            df = pd.read_csv(io.BytesIO(content))
-            print(f"DEBUG: CSV read successfully - {len(df)} rows, {len(df.columns)} columns")
-            print(f"DEBUG: CSV columns: {list(df.columns)}")
-        except Exception as e:
-            print(f"DEBUG: CSV read failed: {e}")
-            raise HTTPException(status_code=400, detail=f"Failed to read CSV file: {str(e)}")
-    elif file.filename.endswith(('.xlsx', '.xls')):
-        # Try different header positions to find the actual column headers
-        df = None
-        
-        # Determine the appropriate engine based on file extension
-        engine = 'openpyxl' if file.filename.endswith('.xlsx') else 'xlrd'
-        
-        # First, let's see what's in the first few rows
-        print(f"DEBUG: Analyzing Excel file structure with engine={engine}...")
-        for row_num in range(10):
-            try:
-                test_df = pd.read_excel(io.BytesIO(content), header=row_num, nrows=1, engine=engine)
-                print(f"DEBUG: Row {row_num} columns: {list(test_df.columns)}")
-            except Exception as e:
-                print(f"DEBUG: Failed to read row {row_num}: {e}")
-                break
-        
-        # Now try to find the best header position
-        for header_row in range(10):  # Try headers 0-9
-            try:
-                test_df = pd.read_excel(io.BytesIO(content), header=header_row, engine=engine)
-                
-                # Check if we found meaningful column names
-                meaningful_cols = []
-                for col in test_df.columns:
-                    col_str = str(col).strip()
-                    if (not col_str.startswith('Unnamed:') and 
-                        col_str not in ['', 'nan', 'NaN', 'None'] and
-                        len(col_str) > 1):
-                        meaningful_cols.append(col_str)
-                
-                print(f"DEBUG: Header {header_row}: {len(meaningful_cols)} meaningful columns: {meaningful_cols}")
-                
-                if len(meaningful_cols) >= 3:  # Need at least 3 meaningful columns
-                    df = test_df
-                    print(f"DEBUG: ✅ Using header={header_row}, found {len(meaningful_cols)} meaningful columns")
-                    print(f"DEBUG: Final columns: {list(df.columns)}")
-                    break
-                    
-            except Exception as e:
-                print(f"DEBUG: Failed to read with header={header_row}: {e}")
-                continue
-        
-        # If still no good columns found, use the original approach
-        if df is None:
-            print(f"DEBUG: ❌ No good header found, using default")
-            df = pd.read_excel(io.BytesIO(content), engine=engine)
-    else:
-        raise HTTPException(status_code=400, detail="Unsupported file format")
+    assert_deal_exists(session, deal_id)
+    
+    df = _parse_upload(file.file, file.filename, min_meaningful_columns=3)
     
     # Basic validation and mapping
     required_columns = ['month', 'year', 'gross_rent', 'operating_expenses']
@@ -252,54 +414,45 @@ async def intake_t12(
             mapping_report={}
         )
     
-    # Calculate derived fields
-    df['total_income'] = df['gross_rent'] + df.get('other_income', 0)
+    # Calculate derived fields; other_income is optional and counts as zero when absent
+    other_income = df['other_income'] if 'other_income' in df.columns else pd.Series(0, index=df.index)
+    df['total_income'] = df['gross_rent'] + other_income
     df['net_operating_income'] = df['total_income'] - df['operating_expenses']
     
-    # Save T-12 data to database
-    from decimal import Decimal
-    from ..models import T12Normalized
-    
-    # Clear existing T-12 data for this deal
-    existing_t12 = session.exec(
-        select(T12Normalized).where(T12Normalized.deal_id == deal_id)
-    ).all()
-    for record in existing_t12:
-        session.delete(record)
-    
-    # Save new T-12 data
-    for _, row in df.iterrows():
-        t12_record = T12Normalized(
-            deal_id=deal_id,
-            month=int(row['month']),
-            year=int(row['year']),
-            gross_rent=Decimal(str(row['gross_rent'])),
-            other_income=Decimal(str(row.get('other_income', 0))),
-            total_income=Decimal(str(row['total_income'])),
-            operating_expenses=Decimal(str(row['operating_expenses'])),
-            net_operating_income=Decimal(str(row['net_operating_income']))
-        )
-        session.add(t12_record)
+    # Convert whole columns to Decimal once instead of per row and field
+    amounts = [
+        (other_income if column == 'other_income' else df[column]).astype(str).map(Decimal).tolist()
+        for column in T12_AMOUNT_COLUMNS
+    ]
+    created_at = datetime.utcnow()
+    record_keys = ("deal_id", "month", "year", *T12_AMOUNT_COLUMNS, "created_at")
+    records = [
+        dict(zip(record_keys, (deal_id, *row, created_at)))
+        for row in zip(df['month'].astype(int).tolist(), df['year'].astype(int).tolist(), *amounts)
+    ]
     
+    # Replace the deal's T-12 data with one DELETE and one bulk INSERT, issued
+    # back to back so the write transaction only opens once the rows are built
+    session.execute(delete(T12Normalized).where(T12Normalized.deal_id == deal_id))
+    if records:
+        session.execute(insert(T12Normalized), records)
     session.commit()
     
-    # Return preview and mapping report
-    # Convert numpy types to Python native types for JSON serialization
-    preview_df = df.head(10).copy()
-    for col in preview_df.columns:
-        if preview_df[col].dtype == 'int64':
-            preview_df[col] = preview_df[col].astype(int)
-        elif preview_df[col].dtype == 'float64':
-            preview_df[col] = preview_df[col].astype(float)
-
-    preview_data = preview_df.to_dict('records')
+    # Return preview and mapping report; only the first rows are serialized
+    # and tolist() yields Python native types for JSON serialization
+    preview_df = df.head(10)
+    preview_columns = list(preview_df.columns)
+    preview_values = [preview_df[col].tolist() for col in preview_columns]
+    preview_data = [dict(zip(preview_columns, row)) for row in zip(*preview_values)]
+    missing_values = df.isna().sum()
+    years = df['year'].to_numpy()
     mapping_report = {
         "total_rows": int(len(df)),
-        "date_range": f"{int(df['year'].min())}-{int(df['year'].max())}",
+        "date_range": f"{int(years.min())}-{int(years.max())}",
         "columns_mapped": list(df.columns),
         "data_quality": {
-            "missing_values": {k: int(v) for k, v in df.isnull().sum().to_dict().items()},
-            "negative_noi_months": int((df['net_operating_income'] < 0).sum())
+            "missing_values": dict(zip(missing_values.index, missing_values.tolist())),
+            "negative_noi_months": int(np.less(df['net_operating_income'].to_numpy(), 0).sum())
         }
     }
     
@@ -312,69 +465,18 @@ async def intake_t12(
 
 
 @router.post("/intake/rentroll/preview/{deal_id}")
-async def preview_rentroll(
+def preview_rentroll(
     deal_id: int,
     file: UploadFile = File(...),
     session: Session = Depends(get_session)
 ) -> IntakeResponse:
     """Preview rent roll data with auto-mapping and normalization."""
     # Verify deal exists
-    deal = session.get(Deal, deal_id)
-    if not deal:
-        raise HTTPException(status_code=404, detail="Deal not found")
-    
-    # Read file content
-    content = await file.read()
-    
-    # Parse based on file extension with improved header detection for rent roll
-    if file.filename.endswith('.csv'):
-        try:
-            df = pd.read_csv(io.BytesIO(content))
-            print(f"DEBUG: CSV read successfully - {len(df)} rows, {len(df.columns)} columns")
-            print(f"DEBUG: CSV columns: {list(df.columns)}")
-        except Exception as e:
-            print(f"DEBUG: CSV read failed: {e}")
-            raise HTTPException(status_code=400, detail=f"Failed to read CSV file: {str(e)}")
-    elif file.filename.endswith(('.xlsx', '.xls')):
-        # Use improved header detection for rent roll files
-        df = None
-        engine = 'openpyxl' if file.filename.endswith('.xlsx') else 'xlrd'
-        
-        print(f"DEBUG: Analyzing Excel file structure with engine={engine}...")
-        for header_row in range(10):  # Try headers 0-9
-            try:
-                test_df = pd.read_excel(io.BytesIO(content), header=header_row, engine=engine)
-                
-                # Check if we found meaningful column names
-                meaningful_cols = []
-                for col in test_df.columns:
-                    col_str = str(col).strip()
-                    if (not col_str.startswith('Unnamed:') and 
-                        col_str not in ['', 'nan', 'NaN', 'None'] and
-                        len(col_str) > 1):
-                        meaningful_cols.append(col_str)
-                
-                print(f"DEBUG: Header {header_row}: {len(meaningful_cols)} meaningful columns: {meaningful_cols[:5]}...")
-                
-                if len(meaningful_cols) >= 5:  # Need at least 5 meaningful columns for rent roll
-                    df = test_df
-                    print(f"DEBUG: ✅ Using header={header_row}, found {len(meaningful_cols)} meaningful columns")
-                    print(f"DEBUG: Final columns: {list(df.columns)[:10]}...")
-                    break
-                    
-            except Exception as e:
-                print(f"DEBUG: Failed to read with header={header_row}: {e}")
-                continue
-        
-        # If still no good columns found, use the original approach
-        if df is None:
-            print(f"DEBUG: ❌ No good header found, using default")
-            df = pd.read_excel(io.BytesIO(content), engine=engine)
-    else:
-        raise HTTPException(status_code=400, detail="Unsupported file format")
+    assert_deal_exists(session, deal_id)
+    
+    df = _parse_upload(file.file, file.filename, min_meaningful_columns=5)
     
     # Use RentRollNormalizer for intelligent processing
-    from ..services.rentroll_normalization import get_rentroll_normalizer
     normalizer = get_rentroll_normalizer(session)
     
     try:
@@ -402,54 +504,54 @@ async def preview_rentroll(
     
 
 @router.post("/intake/rentroll/{deal_id}")
-async def upload_rentroll(
+def upload_rentroll(
     deal_id: int,
     file: UploadFile = File(...),
     session: Session = Depends(get_session)
 ) -> dict:
     """Upload and automatically process rent roll file."""
-    print(f"DEBUG: Starting upload - deal_id: {deal_id}, filename: {file.filename}, content_type: {file.content_type}")
+    logger.debug(
+        "Starting rent roll upload for deal %s: %s (%s)", deal_id, file.filename, file.content_type
+    )
     
     # Verify deal exists
-    deal = session.get(Deal, deal_id)
-    if not deal:
-        raise HTTPException(status_code=404, detail="Deal not found")
+    assert_deal_exists(session, deal_id)
     
     # Validate file
     if not file.filename:
         raise HTTPException(status_code=400, detail="No filename provided")
     
     # Validate file type
-    allowed_extensions = ['.csv', '.xlsx', '.xls']
-    file_ext = Path(file.filename).suffix.lower()
-    if file_ext not in allowed_extensions:
+    allowed_extensions = list(_UPLOAD_READERS)
+    if _upload_suffix(file.filename) not in _UPLOAD_READERS:
         raise HTTPException(
             status_code=400, 
             detail=f"Invalid file type. Supported formats: {', '.join(allowed_extensions)}"
         )
     
-    # Validate file size (50MB limit)
+    # Stream the upload to disk, enforcing the 50MB limit as the bytes arrive
     max_size = 50 * 1024 * 1024  # 50MB
-    content = await file.read()
-    if len(content) > max_size:
-        raise HTTPException(
-            status_code=400, 
-            detail=f"File too large. Maximum size: {max_size // (1024*1024)}MB"
-        )
+    file_path = _document_path(deal_id, file, "rent_roll")
+    file_hash, file_size = _write_upload(file, file_path, max_size)
     
-    print(f"DEBUG: File content size: {len(content)} bytes")
+    logger.debug("Rent roll upload size: %d bytes", file_size)
     
-    # Check for duplicate uploads (idempotency)
-    file_hash = hashlib.md5(content).hexdigest()
+    # Check for duplicate uploads (idempotency); only a completed prior upload counts
     existing_doc = session.exec(
-        select(DealDocument).where(
+        select(
+            DealDocument.id,
+            DealDocument.original_filename,
+            DealDocument.file_size,
+        ).where(
             DealDocument.deal_id == deal_id,
             DealDocument.file_hash == file_hash,
-            DealDocument.file_type == "rent_roll"
-        )
+            DealDocument.file_type == "rent_roll",
+            DealDocument.processing_status == "completed"
+        ).limit(1)
     ).first()
     
-    if existing_doc and existing_doc.processing_status == "completed":
+    if existing_doc:
+        file_path.unlink(missing_ok=True)
         return {
             "success": True,
             "message": "File already processed successfully (duplicate upload detected)",
@@ -463,9 +565,8 @@ async def upload_rentroll(
         }
     
     try:
-        # Save the raw document with the content
-        document = save_document_with_content(deal_id, file, content, "rent_roll", session)
-        print(f"DEBUG: Saved document: {document.original_filename} -> {document.filename}")
+        document = _create_document(deal_id, file, "rent_roll", file_path, file_hash, file_size, session)
+        logger.debug("Saved document %s -> %s", document.original_filename, document.filename)
         
         # Automatically start processing
         document.processing_status = "processing"
@@ -473,8 +574,6 @@ async def upload_rentroll(
         session.commit()
         
         # Process the file using the new parser with retry logic
-        from ..services.rentroll_parser import get_rentroll_parser
-        
         max_retries = 3
         retry_count = 0
         result = None
@@ -482,17 +581,16 @@ async def upload_rentroll(
         while retry_count < max_retries:
             try:
                 parser = get_rentroll_parser(session)
-                result = parser.parse_rentroll(deal_id, document.file_path)
+                # Parse the upload's spooled temp file; small uploads are still in memory
+                result = parser.parse_rentroll(deal_id, document.file_path, file.file)
                 break  # Success, exit retry loop
                 
-            except Exception as e:
+            except RETRYABLE_ERRORS as e:
                 retry_count += 1
                 if retry_count >= max_retries:
                     raise e
-                print(f"DEBUG: Processing attempt {retry_count} failed, retrying: {e}")
-                # Wait before retry (exponential backoff)
-                import time
-                time.sleep(2 ** retry_count)
+                logger.warning("Rent roll processing attempt %d failed, retrying: %s", retry_count, e)
+                time.sleep(_retry_delay(retry_count - 1))
         
         # Check for parsing errors
         if result and "error" in result:
@@ -514,20 +612,19 @@ async def upload_rentroll(
                 break  # Success, exit retry loop
                 
             except Exception as e:
+                # Only transient database/IO errors are worth another attempt
                 persistence_retry_count += 1
-                if persistence_retry_count >= max_persistence_retries:
+                if persistence_retry_count >= max_persistence_retries or not isinstance(e, RETRYABLE_ERRORS):
                     # Mark as failed if persistence fails after retries
                     document.processing_status = "failed"
-                    document.processing_error = f"Failed to persist data after {max_persistence_retries} attempts: {str(e)}"
+                    document.processing_error = f"Failed to persist data after {persistence_retry_count} attempts: {str(e)}"
                     session.commit()
                     raise HTTPException(
                         status_code=500,
                         detail=f"Failed to save rent roll data: {str(e)}"
                     )
-                print(f"DEBUG: Persistence attempt {persistence_retry_count} failed, retrying: {e}")
-                # Wait before retry
-                import time
-                time.sleep(1)
+                logger.warning("Rent roll persistence attempt %d failed, retrying: %s", persistence_retry_count, e)
+                time.sleep(_retry_delay(persistence_retry_count - 1))
         
         # Mark as completed
         document.processing_status = "completed"
@@ -560,7 +657,7 @@ async def upload_rentroll(
             document.processing_error = str(e)
             session.commit()
         
-        print(f"ERROR: Failed to process rent roll: {e}")
+        logger.error("Failed to process rent roll: %s", e)
         raise HTTPException(
             status_code=500, 
             detail=f"Failed to process rent roll: {str(e)}"
@@ -568,7 +665,7 @@ async def upload_rentroll(
 
 
 @router.get("/intake/rentroll/{deal_id}/preview")
-async def preview_rentroll_raw(
+def preview_rentroll_raw(
     deal_id: int,
     session: Session = Depends(get_session)
 ) -> dict:
@@ -587,46 +684,32 @@ async def preview_rentroll_raw(
         raise HTTPException(status_code=404, detail="No rent roll document found for this deal")
     
     try:
-        # Read the file content
-        with open(document.file_path, 'rb') as f:
-            content = f.read()
-        
-        # Parse based on file extension
-        if document.original_filename.endswith('.csv'):
-            df = pd.read_csv(io.BytesIO(content))
-        elif document.original_filename.endswith(('.xlsx', '.xls')):
-            engine = 'openpyxl' if document.original_filename.endswith('.xlsx') else 'xlrd'
-            df = pd.read_excel(io.BytesIO(content), engine=engine)
+        # Parse only the preview rows, letting pandas read the saved file directly
+        suffix = _upload_suffix(document.original_filename)
+        if suffix == '.csv':
+            df = _read_csv_head(document.file_path, RAW_PREVIEW_ROWS)
+        elif suffix in _UPLOAD_READERS:
+            engine = 'openpyxl' if suffix == '.xlsx' else 'xlrd'
+            df = pd.read_excel(document.file_path, engine=engine, nrows=RAW_PREVIEW_ROWS)
         else:
             raise HTTPException(status_code=400, detail="Unsupported file format")
+        total_rows = _count_data_rows(document.file_path, suffix)
         
-        # Convert to JSON-serializable format
-        # Handle NaN and infinity values for JSON serialization
-        df_clean = df.head(20).copy()
-        
-        # Replace NaN and infinity values with None for JSON serialization
-        df_clean = df_clean.replace([float('inf'), float('-inf')], None)
-        df_clean = df_clean.where(pd.notnull(df_clean), None)
+        # Replace NaN and infinity values with None for JSON serialization;
+        # casting to object first keeps None from being coerced back to NaN
+        df_clean = df.replace([float('inf'), float('-inf')], np.nan).astype(object)
+        df_clean = df_clean.where(df_clean.notna(), None)
         
+        # to_dict boxes numpy scalars as Python natives
         preview_data = df_clean.to_dict('records')
         
-        # Convert numpy types to Python native types
-        for record in preview_data:
-            for key, value in record.items():
-                if pd.isna(value):
-                    record[key] = None
-                elif isinstance(value, (np.integer, np.floating)):
-                    record[key] = value.item()
-                elif isinstance(value, np.ndarray):
-                    record[key] = value.tolist()
-        
         return {
             "success": True,
             "message": "Raw data preview generated successfully",
             "document_id": document.id,
             "filename": document.original_filename,
             "file_info": {
-                "total_rows": len(df),
+                "total_rows": total_rows,
                 "total_columns": len(df.columns),
                 "columns": list(df.columns),
                 "preview_rows": len(preview_data)
@@ -642,52 +725,17 @@ async def preview_rentroll_raw(
         }
 
 
-@router.get("/deals/{deal_id}/documents")
-async def get_deal_documents(
-    deal_id: int,
-    session: Session = Depends(get_session)
-) -> List[Dict[str, Any]]:
-    """Get all documents for a deal."""
-    # Verify deal exists
-    deal = session.get(Deal, deal_id)
-    if not deal:
-        raise HTTPException(status_code=404, detail="Deal not found")
-    
-    # Get documents
-    documents = session.exec(
-        select(DealDocument).where(DealDocument.deal_id == deal_id)
-        .order_by(DealDocument.created_at.desc())
-    ).all()
-    
-    return [
-        {
-            "id": doc.id,
-            "filename": doc.original_filename,
-            "file_type": doc.file_type,
-            "file_size": doc.file_size,
-            "processing_status": doc.processing_status,
-            "processing_error": doc.processing_error,
-            "created_at": doc.created_at.isoformat(),
-            "updated_at": doc.updated_at.isoformat()
-        }
-        for doc in documents
-    ]
-
-
 @router.post("/intake/rentroll/commit/{deal_id}")
-async def commit_rentroll(
+def commit_rentroll(
     deal_id: int,
     request: dict,
     session: Session = Depends(get_session)
 ) -> dict:
     """Commit normalized rent roll data to database."""
     # Verify deal exists
-    deal = session.get(Deal, deal_id)
-    if not deal:
-        raise HTTPException(status_code=404, detail="Deal not found")
+    assert_deal_exists(session, deal_id)
     
     try:
-        from ..services.rentroll_normalization import get_rentroll_normalizer
         normalizer = get_rentroll_normalizer(session)
         
         # Get normalized data from request
@@ -712,59 +760,80 @@ async def commit_rentroll(
         raise HTTPException(status_code=500, detail=f"Error committing rent roll: {str(e)}")
 
 
+def _stream_rentroll_units(deal_id: int, total_units: int, rows: Result) -> Iterator[bytes]:
+    """Serialize the unit listing one cursor batch at a time.
+
+    orjson renders the lease dates as ISO 8601 itself, so rows go straight
+    from the cursor to bytes without FastAPI's jsonable_encoder walk.
+    """
+    yield b'{"deal_id":%d,"total_units":%d,"units":[' % (deal_id, total_units)
+    separator = b""
+    for batch in rows.partitions():
+        yield separator + b",".join(orjson.dumps(unit._asdict()) for unit in batch)
+        separator = b","
+    yield b"]}"
+
+
 @router.get("/deals/{deal_id}/rentroll")
-async def get_rentroll_data(
+def get_rentroll_data(
     deal_id: int,
+    limit: Optional[int] = Query(None, ge=1, description="Page size; all units when omitted"),
+    offset: int = Query(0, ge=0),
     session: Session = Depends(get_session)
-) -> dict:
-    """Get normalized rent roll data for a deal."""
+) -> StreamingResponse:
+    """Get normalized rent roll data for a deal, streamed in cursor batches.
+
+    ``total_units`` (and X-Total-Count) is always the deal's full unit count,
+    whatever page was requested.
+    """
     # Verify deal exists
-    deal = session.get(Deal, deal_id)
-    if not deal:
-        raise HTTPException(status_code=404, detail="Deal not found")
-    
-    # Get normalized rent roll data
-    rentroll_data = session.exec(
-        select(RentRollNormalized).where(RentRollNormalized.deal_id == deal_id)
-    ).all()
-    
-    # Convert to response format
-    units = []
-    for unit in rentroll_data:
-        units.append({
-            "id": unit.id,
-            "unit_number": unit.unit_number,
-            "unit_label": unit.unit_label,
-            "unit_type": unit.unit_type,
-            "square_feet": unit.square_feet,
-            "bedrooms": unit.bedrooms,
-            "bathrooms": unit.bathrooms,
-            "actual_rent": float(unit.actual_rent),
-            "market_rent": float(unit.market_rent),
-            "lease_start": unit.lease_start.isoformat() if unit.lease_start else None,
-            "move_in_date": unit.move_in_date.isoformat() if unit.move_in_date else None,
-            "lease_expiration": unit.lease_expiration.isoformat() if unit.lease_expiration else None,
-            "tenant_name": unit.tenant_name,
-            "lease_status": unit.lease_status
-        })
+    assert_deal_exists(session, deal_id)
+    
+    total_units = session.exec(
+        select(func.count()).select_from(RentRollNormalized)
+        .where(RentRollNormalized.deal_id == deal_id)
+    ).one()
+    
+    # Get normalized rent roll data as plain rows of just the output columns,
+    # with rents cast to float in SQL so each row serializes as-is
+    rows = session.exec(
+        select(
+            RentRollNormalized.id,
+            RentRollNormalized.unit_number,
+            RentRollNormalized.unit_label,
+            RentRollNormalized.unit_type,
+            RentRollNormalized.square_feet,
+            RentRollNormalized.bedrooms,
+            RentRollNormalized.bathrooms,
+            as_float(RentRollNormalized.actual_rent),
+            as_float(RentRollNormalized.market_rent),
+            RentRollNormalized.lease_start,
+            RentRollNormalized.move_in_date,
+            RentRollNormalized.lease_expiration,
+            RentRollNormalized.tenant_name,
+            RentRollNormalized.lease_status,
+        ).where(RentRollNormalized.deal_id == deal_id)
+        .order_by(RentRollNormalized.id)
+        .limit(limit)
+        .offset(offset)
+        .execution_options(yield_per=RENTROLL_STREAM_BATCH_SIZE)
+    )
     
-    return {
-        "deal_id": deal_id,
-        "units": units,
-        "total_units": len(units)
-    }
+    return StreamingResponse(
+        _stream_rentroll_units(deal_id, total_units, rows),
+        media_type="application/json",
+        headers={"X-Total-Count": str(total_units)},
+    )
 
 
 @router.get("/deals/{deal_id}/rentroll-assumptions")
-async def get_rentroll_assumptions(
+def get_rentroll_assumptions(
     deal_id: int,
     session: Session = Depends(get_session)
 ) -> dict:
     """Get rent roll assumptions for a deal."""
     # Verify deal exists
-    deal = session.get(Deal, deal_id)
-    if not deal:
-        raise HTTPException(status_code=404, detail="Deal not found")
+    assert_deal_exists(session, deal_id)
     
     # Get or create assumptions
     assumptions = session.exec(
@@ -787,32 +856,18 @@ async def get_rentroll_assumptions(
         session.commit()
         session.refresh(assumptions)
     
-    return {
-        "deal_id": deal_id,
-        "pro_forma_rents": {k: float(v) for k, v in assumptions.pro_forma_rents.items()},
-        "market_rent_growth": float(assumptions.market_rent_growth),
-        "vacancy_rate": float(assumptions.vacancy_rate),
-        "turnover_rate": float(assumptions.turnover_rate),
-        "avg_lease_term": assumptions.avg_lease_term,
-        "lease_renewal_rate": float(assumptions.lease_renewal_rate),
-        "marketing_cost_per_unit": float(assumptions.marketing_cost_per_unit),
-        "turnover_cost_per_unit": float(assumptions.turnover_cost_per_unit),
-        "created_at": assumptions.created_at.isoformat(),
-        "updated_at": assumptions.updated_at.isoformat()
-    }
+    return _assumptions_payload(deal_id, assumptions)
 
 
 @router.post("/deals/{deal_id}/rentroll-assumptions")
-async def update_rentroll_assumptions(
+def update_rentroll_assumptions(
     deal_id: int,
     request: dict,
     session: Session = Depends(get_session)
 ) -> dict:
     """Update rent roll assumptions for a deal."""
     # Verify deal exists
-    deal = session.get(Deal, deal_id)
-    if not deal:
-        raise HTTPException(status_code=404, detail="Deal not found")
+    assert_deal_exists(session, deal_id)
     
     try:
         # Get or create assumptions
@@ -827,54 +882,25 @@ async def update_rentroll_assumptions(
         # Update assumptions from request
         if "pro_forma_rents" in request:
             assumptions.pro_forma_rents = {
-                k: Decimal(str(v)) for k, v in request["pro_forma_rents"].items()
+                k: _to_decimal(v) for k, v in request["pro_forma_rents"].items()
             }
         
-        if "market_rent_growth" in request:
-            assumptions.market_rent_growth = Decimal(str(request["market_rent_growth"]))
-        
-        if "vacancy_rate" in request:
-            assumptions.vacancy_rate = Decimal(str(request["vacancy_rate"]))
-        
-        if "turnover_rate" in request:
-            assumptions.turnover_rate = Decimal(str(request["turnover_rate"]))
-        
-        if "avg_lease_term" in request:
-            assumptions.avg_lease_term = int(request["avg_lease_term"])
-        
-        if "lease_renewal_rate" in request:
-            assumptions.lease_renewal_rate = Decimal(str(request["lease_renewal_rate"]))
-        
-        if "marketing_cost_per_unit" in request:
-            assumptions.marketing_cost_per_unit = Decimal(str(request["marketing_cost_per_unit"]))
-        
-        if "turnover_cost_per_unit" in request:
-            assumptions.turnover_cost_per_unit = Decimal(str(request["turnover_cost_per_unit"]))
+        for field, convert in RENTROLL_ASSUMPTION_FIELDS:
+            if field in request:
+                setattr(assumptions, field, convert(request[field]))
         
         session.commit()
         session.refresh(assumptions)
         
         # Update unit mix with pro forma rents
         if "pro_forma_rents" in request:
-            from ..services.rentroll_normalization import get_rentroll_normalizer
             normalizer = get_rentroll_normalizer(session)
             normalizer._update_pro_forma_rents(deal_id, request["pro_forma_rents"])
         
         return {
             "success": True,
             "message": "Rent roll assumptions updated successfully",
-            "assumptions": {
-                "deal_id": deal_id,
-                "pro_forma_rents": {k: float(v) for k, v in assumptions.pro_forma_rents.items()},
-                "market_rent_growth": float(assumptions.market_rent_growth),
-                "vacancy_rate": float(assumptions.vacancy_rate),
-                "turnover_rate": float(assumptions.turnover_rate),
-                "avg_lease_term": assumptions.avg_lease_term,
-                "lease_renewal_rate": float(assumptions.lease_renewal_rate),
-                "marketing_cost_per_unit": float(assumptions.marketing_cost_per_unit),
-                "turnover_cost_per_unit": float(assumptions.turnover_cost_per_unit),
-                "updated_at": assumptions.updated_at.isoformat()
-            }
+            "assumptions": _assumptions_payload(deal_id, assumptions)
         }
         
     except Exception as e:
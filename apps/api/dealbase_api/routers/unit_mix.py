@@ -1,21 +1,49 @@
 """Unit Mix Summary router with provenance tracking and linking controls."""
 
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 from fastapi import APIRouter, Depends, HTTPException
-from sqlmodel import Session, select
+from sqlmodel import Session, delete, func, insert, select, update
 from datetime import datetime
 from decimal import Decimal
 from pydantic import BaseModel
 import logging
+import pandas as pd
 
 from ..database import get_session
-from ..models import Deal, UnitMixSummary, RentRollNormalized
+from ..models import UnitMixSummary, RentRollNormalized
+from ..utils import as_float, assert_deal_exists
 
 logger = logging.getLogger(__name__)
 
+# Handlers are plain ``def`` so FastAPI runs their blocking Session calls in
+# its threadpool instead of on the event loop.
 router = APIRouter()
 
 
+# Unit type view row columns, money cast to float in SQL; the provenance
+# columns selected after them are read from the first row only
+UNIT_TYPE_ROW_COLUMNS = (
+    UnitMixSummary.id,
+    UnitMixSummary.unit_type,
+    UnitMixSummary.total_units,
+    UnitMixSummary.occupied_units,
+    UnitMixSummary.vacant_units,
+    UnitMixSummary.avg_square_feet,
+    UnitMixSummary.avg_bedrooms,
+    UnitMixSummary.avg_bathrooms,
+    as_float(UnitMixSummary.avg_actual_rent),
+    as_float(UnitMixSummary.avg_market_rent),
+    as_float(UnitMixSummary.rent_premium),
+    as_float(UnitMixSummary.pro_forma_rent, null_if_zero=True),
+    as_float(UnitMixSummary.rent_growth_rate, null_if_zero=True),
+    UnitMixSummary.total_square_feet,
+    as_float(UnitMixSummary.total_actual_rent),
+    as_float(UnitMixSummary.total_market_rent),
+    as_float(UnitMixSummary.total_pro_forma_rent),
+)
+UNIT_TYPE_ROW_KEYS = tuple(column.key for column in UNIT_TYPE_ROW_COLUMNS)
+
+
 class UnitMixRowCreate(BaseModel):
     """Schema for creating a unit mix row."""
     unit_type: str
@@ -63,99 +91,106 @@ class UnitMixResponse(BaseModel):
     totals: dict
 
 
-def derive_unit_mix_from_nrr(deal_id: int, session: Session, rent_roll_name: Optional[str] = None) -> List[UnitMixSummary]:
+def derive_unit_mix_from_nrr(deal_id: int, session: Session, rent_roll_name: Optional[str] = None) -> List[Dict[str, Any]]:
     """Derive unit mix summary from normalized rent roll data."""
-    # Get normalized rent roll data
+    # Load just the aggregated columns, with rents cast to float in SQL
     rent_roll_data = session.exec(
-        select(RentRollNormalized).where(RentRollNormalized.deal_id == deal_id)
+        select(
+            RentRollNormalized.unit_type,
+            RentRollNormalized.unit_label,
+            RentRollNormalized.lease_status,
+            RentRollNormalized.square_feet,
+            RentRollNormalized.bedrooms,
+            RentRollNormalized.bathrooms,
+            as_float(RentRollNormalized.actual_rent),
+            as_float(RentRollNormalized.market_rent),
+        ).where(RentRollNormalized.deal_id == deal_id)
+        .order_by(RentRollNormalized.id)
     ).all()
     
     if not rent_roll_data:
         raise HTTPException(status_code=404, detail="No normalized rent roll data found")
     
-    # Group units by type
-    units_by_type = {}
-    for unit in rent_roll_data:
-        unit_type = unit.unit_type
-        if unit_type not in units_by_type:
-            units_by_type[unit_type] = []
-        units_by_type[unit_type].append(unit)
-    
-    # Clear existing unit mix data for this deal
-    existing_ums = session.exec(
-        select(UnitMixSummary).where(UnitMixSummary.deal_id == deal_id)
-    ).all()
-    for ums in existing_ums:
-        session.delete(ums)
+    units = pd.DataFrame.from_records(rent_roll_data, columns=list(rent_roll_data[0]._fields))
+    units["occupied"] = units["lease_status"].str.lower().eq("occupied")
+    # Zero rents are left out of the rent averages
+    units["actual_rent"] = units["actual_rent"].where(units["actual_rent"] > 0)
+    units["market_rent"] = units["market_rent"].where(units["market_rent"] > 0)
+    
+    # Aggregate every unit type in one pass, keeping first-seen type order
+    by_type = units.groupby("unit_type", sort=False).agg(
+        total_units=("unit_type", "size"),
+        occupied_units=("occupied", "sum"),
+        avg_square_feet=("square_feet", "mean"),
+        avg_bedrooms=("bedrooms", "mean"),
+        avg_bathrooms=("bathrooms", "mean"),
+        avg_actual_rent=("actual_rent", "mean"),
+        avg_market_rent=("market_rent", "mean"),
+        total_square_feet=("square_feet", "sum"),
+        square_feet_count=("square_feet", "count"),
+    )
+    # The label comes from each type's first unit
+    unit_labels = units.drop_duplicates("unit_type").set_index("unit_type")["unit_label"]
     
     # Create new unit mix summaries
     unit_mix_rows = []
     current_time = datetime.utcnow()
     
-    for unit_type, units in units_by_type.items():
-        # Calculate aggregated metrics
-        total_units = len(units)
-        occupied_units = len([u for u in units if u.lease_status.lower() == "occupied"])
+    for group in by_type.itertuples():
+        unit_type = group.Index
+        total_units = int(group.total_units)
+        occupied_units = int(group.occupied_units)
         vacant_units = total_units - occupied_units
         
-        # Calculate averages
-        square_feet_values = [u.square_feet for u in units if u.square_feet is not None]
-        avg_square_feet = int(sum(square_feet_values) / len(square_feet_values)) if square_feet_values else None
-        
-        bedroom_values = [u.bedrooms for u in units if u.bedrooms is not None]
-        avg_bedrooms = sum(bedroom_values) / len(bedroom_values) if bedroom_values else None
-        
-        bathroom_values = [u.bathrooms for u in units if u.bathrooms is not None]
-        avg_bathrooms = sum(bathroom_values) / len(bathroom_values) if bathroom_values else None
+        avg_square_feet = int(group.avg_square_feet) if group.square_feet_count else None
+        avg_bedrooms = None if pd.isna(group.avg_bedrooms) else float(group.avg_bedrooms)
+        avg_bathrooms = None if pd.isna(group.avg_bathrooms) else float(group.avg_bathrooms)
         
         # Calculate rent metrics
-        actual_rents = [float(u.actual_rent) for u in units if u.actual_rent > 0]
-        market_rents = [float(u.market_rent) for u in units if u.market_rent > 0]
-        
-        avg_actual_rent = Decimal(str(sum(actual_rents) / len(actual_rents))) if actual_rents else Decimal("0")
-        avg_market_rent = Decimal(str(sum(market_rents) / len(market_rents))) if market_rents else Decimal("0")
+        avg_actual_rent = Decimal("0") if pd.isna(group.avg_actual_rent) else Decimal(str(group.avg_actual_rent))
+        avg_market_rent = Decimal("0") if pd.isna(group.avg_market_rent) else Decimal(str(group.avg_market_rent))
         
         # Calculate rent premium
         rent_premium = avg_actual_rent - avg_market_rent if avg_market_rent > 0 else Decimal("0")
         
         # Calculate totals
-        total_square_feet = sum(square_feet_values) if square_feet_values else None
+        total_square_feet = int(group.total_square_feet) if group.square_feet_count else None
         total_actual_rent = avg_actual_rent * total_units
         total_market_rent = avg_market_rent * total_units
         total_pro_forma_rent = total_actual_rent  # Default to actual rent
         
-        # Get unit label from first unit
-        unit_label = units[0].unit_label if units and units[0].unit_label else None
+        unit_label = unit_labels[unit_type] or None
         
         # Create unit mix summary row
-        ums = UnitMixSummary(
-            deal_id=deal_id,
-            unit_type=unit_type,
-            unit_label=unit_label,
-            total_units=total_units,
-            occupied_units=occupied_units,
-            vacant_units=vacant_units,
-            avg_square_feet=avg_square_feet,
-            avg_bedrooms=avg_bedrooms,
-            avg_bathrooms=avg_bathrooms,
-            avg_actual_rent=avg_actual_rent,
-            avg_market_rent=avg_market_rent,
-            rent_premium=rent_premium,
-            total_square_feet=total_square_feet,
-            total_actual_rent=total_actual_rent,
-            total_market_rent=total_market_rent,
-            total_pro_forma_rent=total_pro_forma_rent,
-            provenance="NRR",
-            is_linked_to_nrr=True,
-            rent_roll_name=rent_roll_name,
-            last_derived_at=current_time,
-            created_at=current_time,
-            updated_at=current_time
-        )
-        
-        session.add(ums)
-        unit_mix_rows.append(ums)
+        unit_mix_rows.append({
+            "deal_id": deal_id,
+            "unit_type": unit_type,
+            "unit_label": unit_label,
+            "total_units": total_units,
+            "occupied_units": occupied_units,
+            "vacant_units": vacant_units,
+            "avg_square_feet": avg_square_feet,
+            "avg_bedrooms": avg_bedrooms,
+            "avg_bathrooms": avg_bathrooms,
+            "avg_actual_rent": avg_actual_rent,
+            "avg_market_rent": avg_market_rent,
+            "rent_premium": rent_premium,
+            "total_square_feet": total_square_feet,
+            "total_actual_rent": total_actual_rent,
+            "total_market_rent": total_market_rent,
+            "total_pro_forma_rent": total_pro_forma_rent,
+            "provenance": "NRR",
+            "is_linked_to_nrr": True,
+            "rent_roll_name": rent_roll_name,
+            "last_derived_at": current_time,
+            "created_at": current_time,
+            "updated_at": current_time
+        })
     
+    # Replace the deal's unit mix with one DELETE and one executemany INSERT,
+    # issued back to back so the write transaction opens once the rows are built
+    session.execute(delete(UnitMixSummary).where(UnitMixSummary.deal_id == deal_id))
+    session.execute(insert(UnitMixSummary), unit_mix_rows)
     session.commit()
     return unit_mix_rows
 
@@ -456,16 +491,14 @@ def get_unit_mix_by_unit_label(deal_id: int, session: Session) -> UnitMixRespons
 
 
 @router.get("/deals/{deal_id}/unit-mix", response_model=UnitMixResponse)
-async def get_unit_mix(
+def get_unit_mix(
     deal_id: int,
     group_by: str = "square_feet",
     session: Session = Depends(get_session)
 ) -> UnitMixResponse:
     """Get unit mix summary for a deal with automatic refresh."""
     # Verify deal exists
-    deal = session.get(Deal, deal_id)
-    if not deal:
-        raise HTTPException(status_code=404, detail="Deal not found")
+    assert_deal_exists(session, deal_id)
     
     # Always get the latest data by querying the source tables directly
     # This ensures we never serve stale cached data
@@ -480,10 +513,15 @@ async def get_unit_mix(
     else:
         # Default unit type grouping - check if we have fresh unit mix data
         # If not, derive from rent roll data
-        unit_mix_data = session.exec(
-            select(UnitMixSummary).where(UnitMixSummary.deal_id == deal_id)
-            .order_by(UnitMixSummary.unit_type)
-        ).all()
+        unit_mix_query = select(
+            *UNIT_TYPE_ROW_COLUMNS,
+            UnitMixSummary.provenance,
+            UnitMixSummary.is_linked_to_nrr,
+            UnitMixSummary.rent_roll_name,
+            UnitMixSummary.last_derived_at,
+            UnitMixSummary.last_manual_edit_at,
+        ).where(UnitMixSummary.deal_id == deal_id).order_by(UnitMixSummary.unit_type)
+        unit_mix_data = session.exec(unit_mix_query).all()
         
         # If no unit mix data exists or it's stale, derive from rent roll
         if not unit_mix_data:
@@ -491,13 +529,10 @@ async def get_unit_mix(
             try:
                 derive_unit_mix_from_nrr(deal_id, session)
                 # Re-query after derivation
-                unit_mix_data = session.exec(
-                    select(UnitMixSummary).where(UnitMixSummary.deal_id == deal_id)
-                    .order_by(UnitMixSummary.unit_type)
-                ).all()
+                unit_mix_data = session.exec(unit_mix_query).all()
             except Exception as e:
                 # If derivation fails, return empty response
-                logger.warning(f"Failed to derive unit mix for deal {deal_id}: {e}")
+                logger.warning("Failed to derive unit mix for deal %s: %s", deal_id, e)
                 unit_mix_data = []
     
     # Get provenance info from first row (all rows should have same provenance for a deal)
@@ -515,42 +550,23 @@ async def get_unit_mix(
         last_derived_at = first_row.last_derived_at.isoformat() if first_row.last_derived_at else None
         last_manual_edit_at = first_row.last_manual_edit_at.isoformat() if first_row.last_manual_edit_at else None
     
-    # Convert to response format
-    unit_mix = []
-    total_units = 0
-    total_occupied = 0
-    total_actual_rent = Decimal("0")
-    total_market_rent = Decimal("0")
-    
-    for row in unit_mix_data:
-        unit_mix.append({
-            "id": row.id,
-            "unit_type": row.unit_type,
-            "unit_label": None,  # No unit_label column in Type view
-            "total_units": row.total_units,
-            "occupied_units": row.occupied_units,
-            "vacant_units": row.vacant_units,
-            "avg_square_feet": row.avg_square_feet,
-            "avg_bedrooms": row.avg_bedrooms,
-            "avg_bathrooms": row.avg_bathrooms,
-            "avg_actual_rent": float(row.avg_actual_rent),
-            "avg_market_rent": float(row.avg_market_rent),
-            "rent_premium": float(row.rent_premium),
-            "pro_forma_rent": float(row.pro_forma_rent) if row.pro_forma_rent else None,
-            "rent_growth_rate": float(row.rent_growth_rate) if row.rent_growth_rate else None,
-            "total_square_feet": row.total_square_feet,
-            "total_actual_rent": float(row.total_actual_rent),
-            "total_market_rent": float(row.total_market_rent),
-            "total_pro_forma_rent": float(row.total_pro_forma_rent)
-        })
-        
-        total_units += row.total_units
-        total_occupied += row.occupied_units
-        total_actual_rent += row.total_actual_rent
-        total_market_rent += row.total_market_rent
-    
-    # Calculate total square footage from unit_mix data
-    total_square_feet = sum([row["total_square_feet"] for row in unit_mix if row["total_square_feet"] is not None])
+    # Convert to response format; the rows already hold JSON-ready values
+    # and zip stops before the trailing provenance columns
+    unit_mix = [
+        dict(zip(UNIT_TYPE_ROW_KEYS, row), unit_label=None)  # No unit_label column in Type view
+        for row in unit_mix_data
+    ]
+    
+    # Sum the deal's totals in the database rather than over the rows in Python
+    total_units, total_occupied, total_actual_rent, total_market_rent, total_square_feet = session.exec(
+        select(
+            func.coalesce(func.sum(UnitMixSummary.total_units), 0),
+            func.coalesce(func.sum(UnitMixSummary.occupied_units), 0),
+            func.coalesce(func.sum(UnitMixSummary.total_actual_rent), 0),
+            func.coalesce(func.sum(UnitMixSummary.total_market_rent), 0),
+            func.coalesce(func.sum(UnitMixSummary.total_square_feet), 0),
+        ).where(UnitMixSummary.deal_id == deal_id)
+    ).one()
     avg_square_feet = int(total_square_feet / total_units) if total_units > 0 else None
     
     return UnitMixResponse(
@@ -573,15 +589,13 @@ async def get_unit_mix(
 
 
 @router.post("/deals/{deal_id}/unit-mix/derive")
-async def derive_from_rent_roll(
+def derive_from_rent_roll(
     deal_id: int,
     session: Session = Depends(get_session)
 ) -> dict:
     """Derive unit mix summary from normalized rent roll data."""
     # Verify deal exists
-    deal = session.get(Deal, deal_id)
-    if not deal:
-        raise HTTPException(status_code=404, detail="Deal not found")
+    assert_deal_exists(session, deal_id)
     
     try:
         derive_unit_mix_from_nrr(deal_id, session)
@@ -593,26 +607,18 @@ async def derive_from_rent_roll(
 
 
 @router.put("/deals/{deal_id}/unit-mix")
-async def update_unit_mix(
+def update_unit_mix(
     deal_id: int,
     unit_mix_data: List[UnitMixRowCreate],
     session: Session = Depends(get_session)
 ) -> dict:
     """Update unit mix summary with manual edits."""
     # Verify deal exists
-    deal = session.get(Deal, deal_id)
-    if not deal:
-        raise HTTPException(status_code=404, detail="Deal not found")
-    
-    # Clear existing unit mix data
-    existing_ums = session.exec(
-        select(UnitMixSummary).where(UnitMixSummary.deal_id == deal_id)
-    ).all()
-    for ums in existing_ums:
-        session.delete(ums)
+    assert_deal_exists(session, deal_id)
     
     # Create new unit mix rows
     current_time = datetime.utcnow()
+    unit_mix_rows = []
     
     for row_data in unit_mix_data:
         # Calculate derived fields
@@ -622,49 +628,49 @@ async def update_unit_mix(
         total_market_rent = row_data.avg_market_rent * row_data.total_units
         total_pro_forma_rent = (row_data.pro_forma_rent or row_data.avg_actual_rent) * row_data.total_units
         
-        ums = UnitMixSummary(
-            deal_id=deal_id,
-            unit_type=row_data.unit_type,
-            unit_label=row_data.unit_label,
-            total_units=row_data.total_units,
-            occupied_units=row_data.occupied_units,
-            vacant_units=vacant_units,
-            avg_square_feet=row_data.avg_square_feet,
-            avg_bedrooms=row_data.avg_bedrooms,
-            avg_bathrooms=row_data.avg_bathrooms,
-            avg_actual_rent=row_data.avg_actual_rent,
-            avg_market_rent=row_data.avg_market_rent,
-            rent_premium=rent_premium,
-            pro_forma_rent=row_data.pro_forma_rent,
-            rent_growth_rate=row_data.rent_growth_rate,
-            total_square_feet=row_data.avg_square_feet * row_data.total_units if row_data.avg_square_feet else None,
-            total_actual_rent=total_actual_rent,
-            total_market_rent=total_market_rent,
-            total_pro_forma_rent=total_pro_forma_rent,
-            provenance="MANUAL",
-            is_linked_to_nrr=False,
-            last_manual_edit_at=current_time,
-            created_at=current_time,
-            updated_at=current_time
-        )
-        
-        session.add(ums)
+        unit_mix_rows.append({
+            "deal_id": deal_id,
+            "unit_type": row_data.unit_type,
+            "unit_label": row_data.unit_label,
+            "total_units": row_data.total_units,
+            "occupied_units": row_data.occupied_units,
+            "vacant_units": vacant_units,
+            "avg_square_feet": row_data.avg_square_feet,
+            "avg_bedrooms": row_data.avg_bedrooms,
+            "avg_bathrooms": row_data.avg_bathrooms,
+            "avg_actual_rent": row_data.avg_actual_rent,
+            "avg_market_rent": row_data.avg_market_rent,
+            "rent_premium": rent_premium,
+            "pro_forma_rent": row_data.pro_forma_rent,
+            "rent_growth_rate": row_data.rent_growth_rate,
+            "total_square_feet": row_data.avg_square_feet * row_data.total_units if row_data.avg_square_feet else None,
+            "total_actual_rent": total_actual_rent,
+            "total_market_rent": total_market_rent,
+            "total_pro_forma_rent": total_pro_forma_rent,
+            "provenance": "MANUAL",
+            "is_linked_to_nrr": False,
+            "last_manual_edit_at": current_time,
+            "created_at": current_time,
+            "updated_at": current_time
+        })
     
+    # Replace the existing rows only once the new ones are built
+    session.execute(delete(UnitMixSummary).where(UnitMixSummary.deal_id == deal_id))
+    if unit_mix_rows:
+        session.execute(insert(UnitMixSummary), unit_mix_rows)
     session.commit()
     return {"success": True, "message": "Unit mix updated successfully"}
 
 
 @router.post("/deals/{deal_id}/unit-mix/link")
-async def link_to_rent_roll(
+def link_to_rent_roll(
     deal_id: int,
     link_request: LinkRequest,
     session: Session = Depends(get_session)
 ) -> dict:
     """Link unit mix to specific rent roll and derive from NRR."""
     # Verify deal exists
-    deal = session.get(Deal, deal_id)
-    if not deal:
-        raise HTTPException(status_code=404, detail="Deal not found")
+    assert_deal_exists(session, deal_id)
     
     # Verify rent roll exists and belongs to deal
     from ..models import DealDocument
@@ -690,47 +696,43 @@ async def link_to_rent_roll(
 
 
 @router.post("/deals/{deal_id}/unit-mix/unlink")
-async def unlink_from_rent_roll(
+def unlink_from_rent_roll(
     deal_id: int,
     session: Session = Depends(get_session)
 ) -> dict:
     """Unlink unit mix from rent roll, keeping current values for manual editing."""
     # Verify deal exists
-    deal = session.get(Deal, deal_id)
-    if not deal:
-        raise HTTPException(status_code=404, detail="Deal not found")
-    
-    # Update existing unit mix rows to mark as unlinked
-    existing_ums = session.exec(
-        select(UnitMixSummary).where(UnitMixSummary.deal_id == deal_id)
-    ).all()
-    
-    if not existing_ums:
-        raise HTTPException(status_code=404, detail="No unit mix data found")
+    assert_deal_exists(session, deal_id)
     
+    # Mark the deal's unit mix rows as unlinked with a single UPDATE
     current_time = datetime.utcnow()
+    result = session.execute(
+        update(UnitMixSummary)
+        .where(UnitMixSummary.deal_id == deal_id)
+        .values(
+            provenance="MANUAL",
+            is_linked_to_nrr=False,
+            last_manual_edit_at=current_time,
+            updated_at=current_time,
+        )
+    )
     
-    for ums in existing_ums:
-        ums.provenance = "MANUAL"
-        ums.is_linked_to_nrr = False
-        ums.last_manual_edit_at = current_time
-        ums.updated_at = current_time
+    if not result.rowcount:
+        raise HTTPException(status_code=404, detail="No unit mix data found")
     
     session.commit()
     return {"success": True, "message": "Unit mix unlinked from rent roll successfully"}
 
 
 @router.delete("/deals/{deal_id}/unit-mix")
-async def delete_unit_mix_row(
+def delete_unit_mix_row(
     deal_id: int,
     unit_mix_id: int,
     session: Session = Depends(get_session)
 ) -> dict:
     """Delete a specific unit mix row."""
     # Verify deal exists
-    deal = session.get(Deal, deal_id)
-    if not deal:
-        raise HTTPException(status_code=404, detail="Deal not found")
+    assert_deal_exists(session, deal_id)
     
     # Get the unit mix row
     ums = session.get(UnitMixSummary, unit_mix_id)
@@ -754,16 +756,14 @@ class BulkUpdateUnitLabelRequest(BaseModel):
 
 
 @router.patch("/deals/{deal_id}/rentroll/units/labels")
-async def bulk_update_unit_labels(
+def bulk_update_unit_labels(
     deal_id: int,
     request: BulkUpdateUnitLabelRequest,
     session: Session = Depends(get_session)
 ) -> dict:
     """Bulk update unit labels for all units in a floor plan grouping."""
     # Verify deal exists
-    deal = session.get(Deal, deal_id)
-    if not deal:
-        raise HTTPException(status_code=404, detail="Deal not found")
+    assert_deal_exists(session, deal_id)
     
     # Validate unit label format
     if request.new_unit_label:
@@ -7,8 +7,11 @@ from pydantic import BaseModel
 from decimal import Decimal
 
 from ..database import get_session
-from ..models import Deal, ValuationRun, T12Normalized, RentRollNormalized, UnitMixSummary, RentRollAssumptions
+from ..models import ValuationRun, T12Normalized, RentRollNormalized, UnitMixSummary, RentRollAssumptions
+from ..utils import assert_deal_exists
 
+# Handlers are plain ``def`` so FastAPI runs their blocking Session calls in
+# its threadpool instead of on the event loop.
 router = APIRouter()
 
 
@@ -42,16 +45,14 @@ class KPIs(BaseModel):
 
 
 @router.post("/valuation/run/{deal_id}", response_model=ValuationResponse)
-async def run_valuation(
+def run_valuation(
     deal_id: int,
     request: ValuationRequest,
     session: Session = Depends(get_session)
 ) -> ValuationResponse:
     """Run valuation for a deal."""
     # Verify deal exists
-    deal = session.get(Deal, deal_id)
-    if not deal:
-        raise HTTPException(status_code=404, detail="Deal not found")
+    assert_deal_exists(session, deal_id)
     
     # Create valuation run
     valuation_run = ValuationRun(
@@ -114,15 +115,13 @@ async def run_valuation(
 
 
 @router.get("/valuation/runs/{deal_id}", response_model=List[ValuationResponse])
-async def get_valuation_runs(
+def get_valuation_runs(
     deal_id: int,
     session: Session = Depends(get_session)
 ) -> List[ValuationResponse]:
     """Get all valuation runs for a deal."""
     # Verify deal exists
-    deal = session.get(Deal, deal_id)
-    if not deal:
-        raise HTTPException(status_code=404, detail="Deal not found")
+    assert_deal_exists(session, deal_id)
     
     runs = session.exec(
         select(ValuationRun).where(ValuationRun.deal_id == deal_id)
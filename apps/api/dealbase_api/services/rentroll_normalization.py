@@ -4,12 +4,58 @@ import pandas as pd
 from datetime import datetime
 from decimal import Decimal
 from typing import List, Dict, Any, Optional, Tuple
-from sqlmodel import Session, select
+from sqlmodel import Session, delete, insert, select
 from collections import defaultdict
-import re
+import logging
 
 from ..models import Deal, RentRollNormalized, UnitMixSummary, RentRollAssumptions
-from ..utils import log_audit_event
+from ..utils import UNIT_LABEL_INVALID_RE, log_audit_event
+
+logger = logging.getLogger(__name__)
+
+
+def _safe_int(value: Any) -> Optional[int]:
+    """Convert a cell to int, or None when it is blank or not numeric."""
+    if pd.isna(value) or value is None or value == '':
+        return None
+    try:
+        float_val = float(value)
+        if pd.isna(float_val):
+            return None
+        return int(float_val)
+    except (ValueError, TypeError):
+        return None
+
+
+def _safe_bathrooms(value: Any) -> Optional[int]:
+    """Convert a bathroom count, rejecting values outside 0-10."""
+    if pd.isna(value) or value is None:
+        return None
+    try:
+        float_val = float(value)
+        # Bathrooms should be reasonable numbers (0-10)
+        if 0 <= float_val <= 10:
+            return int(float_val)
+        else:
+            logger.warning("Invalid bathroom value %s, setting to None", float_val)
+            return None
+    except (ValueError, TypeError):
+        return None
+
+
+def _safe_date(value: Any) -> Optional[datetime]:
+    """Convert a cell to datetime, handling blanks and NaT."""
+    if pd.isna(value) or value is None or value == '' or value == pd.NaT:
+        return None
+    try:
+        if hasattr(value, 'to_pydatetime'):
+            return value.to_pydatetime()
+        elif hasattr(value, 'date'):
+            return value.date()
+        else:
+            return pd.to_datetime(value).to_pydatetime()
+    except (ValueError, TypeError):
+        return None
 
 
 class RentRollNormalizer:
@@ -29,6 +75,9 @@ class RentRollNormalizer:
     LEASE_END_PATTERNS = ['lease_end', 'end_date', 'lease_exp', 'expiration', 'expire', 'lease end']
     TENANT_PATTERNS = ['tenant', 'resident', 'name', 'tenant_name', 'occupant', 'tenant name']
     
+    # Rows per executemany INSERT when committing normalized units
+    INSERT_BATCH_SIZE = 10000
+    
     def __init__(self, session: Session):
         self.session = session
     
@@ -62,19 +111,14 @@ class RentRollNormalizer:
                 return obj
             
             # Convert the dataframes
-            normalized_records = []
-            for _, row in cleaned_df.iterrows():
-                record = {}
-                for key, value in row.items():
-                    record[key] = convert_types(value)
-                normalized_records.append(record)
+            columns = list(cleaned_df.columns)
+            normalized_records = [
+                {key: convert_types(value) for key, value in zip(columns, row)}
+                for row in cleaned_df.itertuples(index=False, name=None)
+            ]
             
-            preview_records = []
-            for _, row in cleaned_df.head(10).iterrows():
-                record = {}
-                for key, value in row.items():
-                    record[key] = convert_types(value)
-                preview_records.append(record)
+            # The preview is the first rows of the same conversion
+            preview_records = normalized_records[:10]
             
             return {
                 "normalized_data": normalized_records,
@@ -106,10 +150,8 @@ class RentRollNormalizer:
         if len(cleaned) > 16:
             cleaned = cleaned[:16]
         
-        # Check if contains only allowed characters
-        if not re.match(r'^[A-Z0-9\-_]*$', cleaned):
-            # Remove invalid characters
-            cleaned = re.sub(r'[^A-Z0-9\-_]', '', cleaned)
+        # Remove characters outside [A-Z0-9-_]
+        cleaned = UNIT_LABEL_INVALID_RE.sub('', cleaned)
         
         # Return None if empty after cleaning
         return cleaned if cleaned else None
@@ -138,7 +180,7 @@ class RentRollNormalizer:
             for i, col in enumerate(columns_lower):
                 if col == priority_column and 'unit_label' not in mapping:
                     mapping['unit_label'] = df.columns[i]
-                    print(f"DEBUG: Mapped unit_label to column: '{df.columns[i]}' (priority: '{priority_column}')")
+                    logger.debug("Mapped unit_label to column %r (priority %r)", df.columns[i], priority_column)
                     break
             if 'unit_label' in mapping:
                 break
@@ -162,7 +204,7 @@ class RentRollNormalizer:
             for i, col in enumerate(columns_lower):
                 if pattern in col and 'bathrooms' not in mapping:
                     mapping['bathrooms'] = df.columns[i]
-                    print(f"DEBUG: Mapped bathrooms to column: '{df.columns[i]}' (pattern: '{pattern}')")
+                    logger.debug("Mapped bathrooms to column %r (pattern %r)", df.columns[i], pattern)
                     break
         
         # Rent detection (prioritize actual/in-place rent)
@@ -200,7 +242,7 @@ class RentRollNormalizer:
                     mapping['tenant_name'] = df.columns[i]
                     break
         
-        print(f"DEBUG: Final column mapping: {mapping}")
+        logger.debug("Final column mapping: %s", mapping)
         return mapping
     
     def _normalize_dataframe(self, df: pd.DataFrame, mapping: Dict[str, str]) -> pd.DataFrame:
@@ -346,98 +388,40 @@ class RentRollNormalizer:
     def commit_to_database(self, deal_id: int, normalized_data: List[Dict[str, Any]]) -> bool:
         """Commit normalized rent roll data to database."""
         try:
-            # Clear existing rent roll data
-            existing_data = self.session.exec(
-                select(RentRollNormalized).where(RentRollNormalized.deal_id == deal_id)
-            ).all()
-            
-            for record in existing_data:
-                self.session.delete(record)
+            # Build plain rows once and insert them in batches
+            created_at = datetime.utcnow()
+            rows = [
+                {
+                    'deal_id': deal_id,
+                    'unit_number': str(row.get('unit_number', '')),
+                    'unit_label': row.get('unit_label'),
+                    'unit_type': row.get('unit_type', 'Unknown'),
+                    'square_feet': _safe_int(row.get('square_feet')),
+                    'bedrooms': _safe_int(row.get('bedrooms')),
+                    'bathrooms': _safe_bathrooms(row.get('bathrooms')),
+                    'rent': Decimal(str(row.get('actual_rent', 0))),  # Populate old rent column
+                    'actual_rent': Decimal(str(row.get('actual_rent', 0))),
+                    'market_rent': Decimal(str(row.get('market_rent', 0))),
+                    'lease_start': _safe_date(row.get('lease_start')),
+                    'move_in_date': _safe_date(row.get('move_in_date')),
+                    'lease_expiration': _safe_date(row.get('lease_expiration')),
+                    'tenant_name': row.get('tenant_name'),
+                    'lease_status': row.get('lease_status', 'occupied'),
+                    'is_duplicate': bool(row.get('is_duplicate', False)),
+                    'is_application': bool(row.get('is_application', False)),
+                    'data_source': 'upload',
+                    'created_at': created_at,
+                    'updated_at': created_at,
+                }
+                for row in normalized_data
+            ]
             
-            # Insert new normalized data
-            for row in normalized_data:
-                # Parse date strings to datetime objects
-                def parse_date(date_str):
-                    if not date_str:
-                        return None
-                    if isinstance(date_str, str):
-                        try:
-                            return pd.to_datetime(date_str).to_pydatetime()
-                        except:
-                            return None
-                    return date_str
-                
-                # Helper function to safely convert to int
-                def safe_int(value):
-                    if pd.isna(value) or value is None or value == '':
-                        return None
-                    try:
-                        float_val = float(value)
-                        if pd.isna(float_val):
-                            return None
-                        return int(float_val)
-                    except (ValueError, TypeError):
-                        return None
-                
-                # Helper function to safely convert to float
-                def safe_float(value):
-                    if pd.isna(value) or value is None:
-                        return None
-                    try:
-                        return float(value)
-                    except (ValueError, TypeError):
-                        return None
-                
-                # Helper function to safely convert bathrooms (should be small integers)
-                def safe_bathrooms(value):
-                    if pd.isna(value) or value is None:
-                        return None
-                    try:
-                        float_val = float(value)
-                        # Bathrooms should be reasonable numbers (0-10)
-                        if 0 <= float_val <= 10:
-                            return int(float_val)
-                        else:
-                            print(f"WARNING: Invalid bathroom value {float_val}, setting to None")
-                            return None
-                    except (ValueError, TypeError):
-                        return None
-                
-                # Helper function to safely convert dates, handling NaT values
-                def safe_date(value):
-                    if pd.isna(value) or value is None or value == '' or value == pd.NaT:
-                        return None
-                    try:
-                        if hasattr(value, 'to_pydatetime'):
-                            return value.to_pydatetime()
-                        elif hasattr(value, 'date'):
-                            return value.date()
-                        else:
-                            return pd.to_datetime(value).to_pydatetime()
-                    except (ValueError, TypeError):
-                        return None
-                
-                rentroll_record = RentRollNormalized(
-                    deal_id=deal_id,
-                    unit_number=str(row.get('unit_number', '')),
-                    unit_label=row.get('unit_label'),
-                    unit_type=row.get('unit_type', 'Unknown'),
-                    square_feet=safe_int(row.get('square_feet')),
-                    bedrooms=safe_int(row.get('bedrooms')),
-                    bathrooms=safe_bathrooms(row.get('bathrooms')),
-                    rent=Decimal(str(row.get('actual_rent', 0))),  # Populate old rent column
-                    actual_rent=Decimal(str(row.get('actual_rent', 0))),
-                    market_rent=Decimal(str(row.get('market_rent', 0))),
-                    lease_start=safe_date(row.get('lease_start')),
-                    move_in_date=safe_date(row.get('move_in_date')),
-                    lease_expiration=safe_date(row.get('lease_expiration')),
-                    tenant_name=row.get('tenant_name'),
-                    lease_status=row.get('lease_status', 'occupied'),
-                    is_duplicate=bool(row.get('is_duplicate', False)),
-                    is_application=bool(row.get('is_application', False)),
-                    data_source='upload'
-                )
-                self.session.add(rentroll_record)
+            # Clear existing rent roll data only once the replacement rows are built
+            self.session.execute(
+                delete(RentRollNormalized).where(RentRollNormalized.deal_id == deal_id)
+            )
+            for start in range(0, len(rows), self.INSERT_BATCH_SIZE):
+                self.session.execute(insert(RentRollNormalized), rows[start:start + self.INSERT_BATCH_SIZE])
             
             self.session.commit()
             
@@ -473,12 +457,9 @@ class RentRollNormalizer:
         rent_roll_name = rent_roll_doc.original_filename if rent_roll_doc else None
         
         # Clear existing unit mix data
-        existing_summary = self.session.exec(
-            select(UnitMixSummary).where(UnitMixSummary.deal_id == deal_id)
-        ).all()
-        
-        for record in existing_summary:
-            self.session.delete(record)
+        self.session.execute(
+            delete(UnitMixSummary).where(UnitMixSummary.deal_id == deal_id)
+        )
         
         # Get normalized rent roll data
         rentroll_data = self.session.exec(
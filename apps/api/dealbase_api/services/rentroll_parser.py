@@ -13,16 +13,16 @@ import pandas as pd
 import numpy as np
 from datetime import datetime, date
 from decimal import Decimal
-from typing import Dict, List, Any, Optional, Tuple, Union
+from typing import BinaryIO, Dict, List, Any, Optional, Tuple, Union
 from pathlib import Path
 import io
 import logging
-import re
 
 from ..models import RentRollNormalized, UnitMixSummary, DealDocument
 from ..database import Session
+from ..utils import UNIT_LABEL_INVALID_RE
 from sqlalchemy.orm import selectinload
-from sqlalchemy import select
+from sqlalchemy import delete, insert, select
 
 logger = logging.getLogger(__name__)
 
@@ -48,18 +48,28 @@ class RentRollParser:
     # Unit label priority order: "unit label", "floorplan", "plan", "unit type"
     UNIT_LABEL_COLUMNS = ['unit label', 'floorplan', 'plan', 'unit type']
     
+    # Leading Excel rows searched for the header row
+    HEADER_PROBE_ROWS = 10
+    
+    # Rows per executemany INSERT when persisting normalized units
+    INSERT_BATCH_SIZE = 10000
+    
     def __init__(self, session: Session):
         self.session = session
         self.issues: List[Dict[str, Any]] = []
         self.validation_errors: List[str] = []
         
-    def parse_rentroll(self, deal_id: int, file_path: str) -> Dict[str, Any]:
+    def parse_rentroll(
+        self, deal_id: int, file_path: str, content: Optional[Union[bytes, BinaryIO]] = None
+    ) -> Dict[str, Any]:
         """
         Parse a rent roll file and return normalized data with robust error handling.
         
         Args:
             deal_id: Deal ID to associate with the rent roll
             file_path: Path to the rent roll file
+            content: The file's bytes or a seekable binary file holding them (such as
+                the upload's spooled temp file); skips re-reading file_path
             
         Returns:
             Dictionary containing:
@@ -68,6 +78,10 @@ class RentRollParser:
             - validation_report: Validation results
             - metadata: Provenance and processing metadata
             - parsing_summary: Detailed summary of row filtering and processing
+            
+        Raises:
+            ValueError: The file could not be parsed as a rent roll
+            OSError: Reading the file failed; left unwrapped so callers can retry
         """
         self.issues = []
         self.validation_errors = []
@@ -88,14 +102,18 @@ class RentRollParser:
         try:
             # Step 1: Read the file with error handling
             try:
-                df = self._read_file(file_path)
+                df = self._read_file(file_path, content)
                 self.parsing_summary['total_rows_read'] = len(df)
                 
                 if df.empty:
                     raise ValueError("File contains no data")
                     
-                logger.info(f"Successfully read {len(df)} rows from {file_path}")
+                logger.info("Successfully read %s rows from %s", len(df), file_path)
                 
+            except OSError:
+                # I/O failures say nothing about the file's content, so they
+                # propagate as-is for the caller to retry
+                raise
             except Exception as e:
                 error_msg = f"Failed to read file {file_path}: {str(e)}"
                 logger.error(error_msg)
@@ -112,7 +130,7 @@ class RentRollParser:
                 if 'actual_rent' not in column_mapping and 'market_rent' not in column_mapping:
                     raise ValueError("Could not detect rent column. Please ensure your file has a column containing rent amounts.")
                     
-                logger.info(f"Column mapping successful: {list(column_mapping.keys())}")
+                logger.info("Column mapping successful: %s", list(column_mapping.keys()))
                 
             except Exception as e:
                 error_msg = f"Column detection failed: {str(e)}"
@@ -126,7 +144,7 @@ class RentRollParser:
                 if filtered_df.empty:
                     raise ValueError("No valid unit rows found after filtering. Please check your data format.")
                     
-                logger.info(f"Filtered to {len(filtered_df)} valid unit rows")
+                logger.info("Filtered to %s valid unit rows", len(filtered_df))
                 
             except Exception as e:
                 error_msg = f"Row filtering failed: {str(e)}"
@@ -136,7 +154,7 @@ class RentRollParser:
             # Step 4: Normalize the data with error handling
             try:
                 normalized_df = self._normalize_dataframe(filtered_df, column_mapping)
-                logger.info(f"Normalized {len(normalized_df)} rows")
+                logger.info("Normalized %s rows", len(normalized_df))
                 
             except Exception as e:
                 error_msg = f"Data normalization failed: {str(e)}"
@@ -151,7 +169,7 @@ class RentRollParser:
                 if deduplicated_df.empty:
                     raise ValueError("No valid units remaining after duplicate resolution")
                     
-                logger.info(f"Resolved duplicates, {len(deduplicated_df)} unique units remaining")
+                logger.info("Resolved duplicates, %s unique units remaining", len(deduplicated_df))
                 
             except Exception as e:
                 error_msg = f"Duplicate resolution failed: {str(e)}"
@@ -161,10 +179,13 @@ class RentRollParser:
             # Step 6: Validate the data
             try:
                 validation_report = self._validate_data(deduplicated_df)
-                logger.info(f"Validation completed with {len(validation_report['errors'])} errors, {len(validation_report['warnings'])} warnings")
+                logger.info(
+                    "Validation completed with %s errors, %s warnings",
+                    len(validation_report['errors']), len(validation_report['warnings']),
+                )
                 
             except Exception as e:
-                logger.warning(f"Validation failed: {str(e)}, continuing with basic validation")
+                logger.warning("Validation failed: %s, continuing with basic validation", e)
                 validation_report = {
                     'total_records': len(deduplicated_df),
                     'valid_records': len(deduplicated_df),
@@ -176,7 +197,7 @@ class RentRollParser:
             # Step 7: Convert to records with error handling
             try:
                 normalized_records = self._dataframe_to_records(deduplicated_df)
-                logger.info(f"Converted to {len(normalized_records)} records")
+                logger.info("Converted to %s records", len(normalized_records))
                 
             except Exception as e:
                 error_msg = f"Record conversion failed: {str(e)}"
@@ -189,7 +210,7 @@ class RentRollParser:
                 logger.info("Metadata generation completed")
                 
             except Exception as e:
-                logger.warning(f"Metadata generation failed: {str(e)}, using basic metadata")
+                logger.warning("Metadata generation failed: %s, using basic metadata", e)
                 metadata = {
                     'deal_id': deal_id,
                     'source_file': str(file_path),
@@ -209,7 +230,9 @@ class RentRollParser:
             
         except ValueError as e:
             # Re-raise ValueError as-is (these are user-friendly error messages)
-            logger.error(f"Rent roll parsing failed: {e}")
+            logger.error("Rent roll parsing failed: %s", e)
+            raise
+        except OSError:
             raise
         except Exception as e:
             # Catch any unexpected errors and provide a generic message
@@ -457,32 +480,25 @@ class RentRollParser:
             
             # Priority 2: Lease period includes today (if we have lease dates)
             if 'lease_start' in group.columns and 'lease_expiration' in group.columns:
-                today = pd.Timestamp.now().date()
-                current_lease = []
+                today = pd.Timestamp.now().normalize()
+                # format='mixed' parses each value on its own, as a per-row parse would
+                start_dates = pd.to_datetime(candidates['lease_start'], errors='coerce', format='mixed')
+                end_dates = pd.to_datetime(candidates['lease_expiration'], errors='coerce', format='mixed')
+                in_lease = (start_dates.dt.normalize() <= today) & (today <= end_dates.dt.normalize())
+                current_lease = candidates[in_lease]
                 
-                for _, row in candidates.iterrows():
-                    start_date = pd.to_datetime(row['lease_start'], errors='coerce')
-                    end_date = pd.to_datetime(row['lease_expiration'], errors='coerce')
-                    
-                    if pd.notna(start_date) and pd.notna(end_date):
-                        if start_date.date() <= today <= end_date.date():
-                            current_lease.append(row)
-                
-                if current_lease:
+                if len(current_lease):
                     # Keep the most recent move-in date among current leases
                     if len(current_lease) == 1:
-                        resolved_rows.append(current_lease[0])
-                        self._log_duplicate_resolution(unit_num, "current lease", group, current_lease[0])
+                        resolved_rows.append(current_lease.iloc[0])
+                        self._log_duplicate_resolution(unit_num, "current lease", group, current_lease.iloc[0])
                         continue
                     else:
                         # Multiple current leases - pick most recent move-in
-                        current_df = pd.DataFrame(current_lease)
-                        if 'lease_start' in current_df.columns:
-                            current_df['lease_start_date'] = pd.to_datetime(current_df['lease_start'], errors='coerce')
-                            best_row = current_df.loc[current_df['lease_start_date'].idxmax()]
-                            resolved_rows.append(best_row)
-                            self._log_duplicate_resolution(unit_num, "most recent move-in", group, best_row)
-                            continue
+                        best_row = current_lease.loc[start_dates[in_lease].idxmax()]
+                        resolved_rows.append(best_row)
+                        self._log_duplicate_resolution(unit_num, "most recent move-in", group, best_row)
+                        continue
             
             # Priority 3: Most recent move-in/lease start
             if 'lease_start' in candidates.columns:
@@ -530,19 +546,32 @@ class RentRollParser:
         
         return unit_str
     
-    def _read_file(self, file_path: str) -> pd.DataFrame:
-        """Read the rent roll file based on its extension."""
+    def _read_file(self, file_path: str, content: Optional[Union[bytes, BinaryIO]] = None) -> pd.DataFrame:
+        """Read the rent roll file based on its extension.
+        
+        When ``content`` (bytes or a seekable binary file) is given it is
+        parsed instead and ``file_path`` is only used for its extension.
+        """
         file_path = Path(file_path)
         
-        if not file_path.exists():
+        if content is None and not file_path.exists():
             raise FileNotFoundError(f"File not found: {file_path}")
         
+        def source():
+            # A fresh buffer (or a rewound file) per read, since each pandas read consumes it
+            if content is None:
+                return file_path
+            if isinstance(content, bytes):
+                return io.BytesIO(content)
+            content.seek(0)
+            return content
+        
         try:
             if file_path.suffix.lower() == '.csv':
                 # Try different encodings for CSV
                 for encoding in ['utf-8', 'latin-1', 'cp1252']:
                     try:
-                        df = pd.read_csv(file_path, encoding=encoding)
+                        df = pd.read_csv(source(), encoding=encoding)
                         break
                     except UnicodeDecodeError:
                         continue
@@ -550,32 +579,27 @@ class RentRollParser:
                     raise ValueError("Could not decode CSV file with any supported encoding")
                     
             elif file_path.suffix.lower() in ['.xlsx', '.xls']:
-                # Try different header rows for Excel
+                # Read the leading rows once and pick the header row from them,
+                # rather than re-parsing the workbook for every candidate row
                 df = None
                 engine = 'openpyxl' if file_path.suffix.lower() == '.xlsx' else 'xlrd'
                 
-                for header_row in range(10):  # Try headers 0-9
-                    try:
-                        test_df = pd.read_excel(file_path, header=header_row, engine=engine)
-                        
-                        # Check if we found meaningful column names
-                        meaningful_cols = self._count_meaningful_columns(test_df)
-                        
-                        if meaningful_cols >= 5:  # Need at least 5 meaningful columns
-                            df = test_df
-                            self.issues.append({
-                                'type': 'info',
-                                'message': f"Using header row {header_row} with {meaningful_cols} meaningful columns",
-                                'severity': 'low'
-                            })
-                            break
-                            
-                    except Exception as e:
-                        continue
+                probe = pd.read_excel(source(), header=None, nrows=self.HEADER_PROBE_ROWS, engine=engine)
+                for header_row, row in enumerate(probe.itertuples(index=False, name=None)):
+                    meaningful_cols = self._count_meaningful_columns(row)
+                    
+                    if meaningful_cols >= 5:  # Need at least 5 meaningful columns
+                        df = pd.read_excel(source(), header=header_row, engine=engine)
+                        self.issues.append({
+                            'type': 'info',
+                            'message': f"Using header row {header_row} with {meaningful_cols} meaningful columns",
+                            'severity': 'low'
+                        })
+                        break
                 
                 if df is None:
                     # Fallback to default header
-                    df = pd.read_excel(file_path, engine=engine)
+                    df = pd.read_excel(source(), engine=engine)
                     self.issues.append({
                         'type': 'warning',
                         'message': "Could not find optimal header row, using default",
@@ -598,10 +622,10 @@ class RentRollParser:
         except Exception as e:
             raise ValueError(f"Failed to read file {file_path}: {str(e)}")
     
-    def _count_meaningful_columns(self, df: pd.DataFrame) -> int:
-        """Count meaningful (non-empty, non-unnamed) columns."""
+    def _count_meaningful_columns(self, labels) -> int:
+        """Count meaningful (non-empty, non-unnamed) column labels."""
         meaningful_cols = 0
-        for col in df.columns:
+        for col in labels:
             col_str = str(col).strip()
             if (not col_str.startswith('Unnamed:') and 
                 col_str not in ['', 'nan', 'NaN', 'None'] and
@@ -634,10 +658,8 @@ class RentRollParser:
         if len(cleaned) > 16:
             cleaned = cleaned[:16]
         
-        # Check if contains only allowed characters
-        if not re.match(r'^[A-Z0-9\-_]*$', cleaned):
-            # Remove invalid characters
-            cleaned = re.sub(r'[^A-Z0-9\-_]', '', cleaned)
+        # Remove invalid characters
+        cleaned = UNIT_LABEL_INVALID_RE.sub('', cleaned)
         
         # Return None if empty after cleaning
         return cleaned if cleaned else None
@@ -713,8 +735,8 @@ class RentRollParser:
         if 'bedrooms' in column_mapping:
             bedrooms = pd.to_numeric(df[column_mapping['bedrooms']], errors='coerce').fillna(0)
             # Only use reasonable bedroom counts (0-5) for unit type inference
-            bedrooms = bedrooms.apply(lambda x: x if 0 <= x <= 5 else 0)
-            normalized_df['unit_type'] = bedrooms.apply(lambda x: f"{int(x)}BR" if x > 0 else "Studio")
+            bedrooms = bedrooms.where(bedrooms.between(0, 5), 0)
+            normalized_df['unit_type'] = (bedrooms.astype(int).astype(str) + "BR").where(bedrooms > 0, "Studio")
         elif 'unit_type' in column_mapping:
             normalized_df['unit_type'] = df[column_mapping['unit_type']].astype(str).str.strip()
         else:
@@ -797,9 +819,8 @@ class RentRollParser:
             normalized_df['lease_status'] = df[column_mapping['lease_status']].astype(str).str.strip()
         else:
             # Infer from tenant name
-            normalized_df['lease_status'] = normalized_df['tenant_name'].apply(
-                lambda x: 'occupied' if x and x.lower() not in ['vacant', '', 'nan'] else 'vacant'
-            )
+            vacant = normalized_df['tenant_name'].str.lower().isin(['vacant', '', 'nan'])
+            normalized_df['lease_status'] = np.where(vacant, 'vacant', 'occupied')
         
         # Additional fields
         normalized_df['rent'] = normalized_df['actual_rent']  # For backward compatibility
@@ -852,22 +873,21 @@ class RentRollParser:
     
     def _dataframe_to_records(self, df: pd.DataFrame) -> List[Dict[str, Any]]:
         """Convert dataframe to list of records for database insertion."""
-        records = []
-        
-        for _, row in df.iterrows():
-            record = {}
-            for key, value in row.items():
-                if pd.isna(value):
-                    record[key] = None
-                elif isinstance(value, (np.integer, np.floating)):
-                    record[key] = value.item()
-                elif isinstance(value, pd.Timestamp):
-                    record[key] = value.to_pydatetime()
-                else:
-                    record[key] = value
-            records.append(record)
-        
-        return records
+        columns = list(df.columns)
+        return [
+            {key: self._native_value(value) for key, value in zip(columns, row)}
+            for row in df.itertuples(index=False, name=None)
+        ]
+    
+    def _native_value(self, value: Any) -> Any:
+        """Convert a single cell to a Python native value, with None for missing."""
+        if pd.isna(value):
+            return None
+        if isinstance(value, (np.integer, np.floating)):
+            return value.item()
+        if isinstance(value, pd.Timestamp):
+            return value.to_pydatetime()
+        return value
     
     def _convert_numpy_types(self, obj):
         """Recursively convert numpy types to Python native types for JSON serialization."""
@@ -902,87 +922,86 @@ class RentRollParser:
         try:
             # Create a version timestamp for this update
             version_timestamp = datetime.utcnow()
-            logger.info(f"Starting atomic persistence for deal {deal_id} at {version_timestamp}")
+            logger.info("Starting atomic persistence for deal %s at %s", deal_id, version_timestamp)
             
             # Use a savepoint for nested transaction safety
             savepoint = self.session.begin_nested()
             
             try:
                 # Clear existing normalized data for this deal
-                existing_records = self.session.query(RentRollNormalized).filter(
-                    RentRollNormalized.deal_id == deal_id
-                ).all()
-                
-                logger.info(f"Clearing {len(existing_records)} existing rent roll records for deal {deal_id}")
-                for record in existing_records:
-                    self.session.delete(record)
+                cleared = self.session.execute(
+                    delete(RentRollNormalized).where(RentRollNormalized.deal_id == deal_id)
+                )
+                logger.info("Cleared %s existing rent roll records for deal %s", cleared.rowcount, deal_id)
                 
                 # Clear existing unit mix data
-                existing_unit_mix = self.session.query(UnitMixSummary).filter(
-                    UnitMixSummary.deal_id == deal_id
-                ).all()
-                
-                logger.info(f"Clearing {len(existing_unit_mix)} existing unit mix records for deal {deal_id}")
-                for summary in existing_unit_mix:
-                    self.session.delete(summary)
+                cleared = self.session.execute(
+                    delete(UnitMixSummary).where(UnitMixSummary.deal_id == deal_id)
+                )
+                logger.info("Cleared %s existing unit mix records for deal %s", cleared.rowcount, deal_id)
                 
-                # Insert new normalized records with validation
-                logger.info(f"Inserting {len(normalized_records)} new rent roll records for deal {deal_id}")
-                validated_count = 0
+                # Validate and convert the records, then insert them in batches
+                logger.info("Inserting %s new rent roll records for deal %s", len(normalized_records), deal_id)
+                rows = []
                 
                 for i, record in enumerate(normalized_records):
                     try:
                         # Validate required fields
                         if not record.get('unit_number'):
-                            logger.warning(f"Skipping record {i}: missing unit_number")
+                            logger.warning("Skipping record %s: missing unit_number", i)
                             continue
                             
                         if not record.get('actual_rent') and not record.get('market_rent'):
-                            logger.warning(f"Skipping record {i}: missing rent data")
+                            logger.warning("Skipping record %s: missing rent data", i)
                             continue
                         
-                        normalized_record = RentRollNormalized(
-                            deal_id=deal_id,
-                            unit_number=str(record.get('unit_number', '')),
-                            unit_label=record.get('unit_label', ''),
-                            unit_type=record.get('unit_type', ''),
-                            square_feet=self._safe_int(record.get('square_feet')),
-                            bedrooms=self._safe_int(record.get('bedrooms')),
-                            bathrooms=self._safe_float(record.get('bathrooms')),
-                            rent=self._safe_decimal(record.get('rent')),
-                            actual_rent=self._safe_decimal(record.get('actual_rent')),
-                            market_rent=self._safe_decimal(record.get('market_rent')),
-                            lease_start=self._safe_datetime(record.get('lease_start')),
-                            move_in_date=self._safe_datetime(record.get('move_in_date')),
-                            lease_expiration=self._safe_datetime(record.get('lease_expiration')),
-                            tenant_name=record.get('tenant_name', ''),
-                            lease_status=record.get('lease_status', ''),
-                            is_duplicate=record.get('is_duplicate', False),
-                            is_application=record.get('is_application', False),
-                            data_source=record.get('data_source', 'upload')
-                        )
-                        
-                        self.session.add(normalized_record)
-                        validated_count += 1
+                        rows.append({
+                            'deal_id': deal_id,
+                            'unit_number': str(record.get('unit_number', '')),
+                            'unit_label': record.get('unit_label', ''),
+                            'unit_type': record.get('unit_type', ''),
+                            'square_feet': self._safe_int(record.get('square_feet')),
+                            'bedrooms': self._safe_int(record.get('bedrooms')),
+                            'bathrooms': self._safe_float(record.get('bathrooms')),
+                            'rent': self._safe_decimal(record.get('rent')),
+                            'actual_rent': self._safe_decimal(record.get('actual_rent')),
+                            'market_rent': self._safe_decimal(record.get('market_rent')),
+                            'lease_start': self._safe_datetime(record.get('lease_start')),
+                            'move_in_date': self._safe_datetime(record.get('move_in_date')),
+                            'lease_expiration': self._safe_datetime(record.get('lease_expiration')),
+                            'tenant_name': record.get('tenant_name', ''),
+                            'lease_status': record.get('lease_status', ''),
+                            'is_duplicate': record.get('is_duplicate', False),
+                            'is_application': record.get('is_application', False),
+                            'data_source': record.get('data_source', 'upload'),
+                            'created_at': version_timestamp,
+                            'updated_at': version_timestamp,
+                        })
                         
                     except Exception as e:
-                        logger.error(f"Failed to create record {i}: {e}")
+                        logger.error("Failed to create record %s: %s", i, e)
                         continue
                 
+                validated_count = len(rows)
+                for start in range(0, validated_count, self.INSERT_BATCH_SIZE):
+                    self.session.execute(
+                        insert(RentRollNormalized), rows[start:start + self.INSERT_BATCH_SIZE]
+                    )
+                
                 if validated_count == 0:
                     raise ValueError("No valid records to insert after validation")
                 
                 # Commit the rent roll data
                 savepoint.commit()
                 self.session.commit()
-                logger.info(f"Successfully committed {validated_count} rent roll records")
+                logger.info("Successfully committed %s rent roll records", validated_count)
                 
                 # Generate unit mix summary in a separate transaction
                 try:
                     self._generate_unit_mix_summary(deal_id, normalized_records)
-                    logger.info(f"Successfully generated unit mix summary for deal {deal_id}")
+                    logger.info("Successfully generated unit mix summary for deal %s", deal_id)
                 except Exception as e:
-                    logger.error(f"Failed to generate unit mix summary: {e}")
+                    logger.error("Failed to generate unit mix summary: %s", e)
                     # Don't fail the whole operation if unit mix generation fails
                     # The rent roll data is already committed
                 
@@ -1001,37 +1020,37 @@ class RentRollParser:
                         document.issues_found = issues_count
                         document.updated_at = version_timestamp
                         self.session.commit()
-                        logger.info(f"Updated document {document.id} status to completed with {len(records)} records, {issues_count} issues")
+                        logger.info(
+                            "Updated document %s status to completed with %s records, %s issues",
+                            document.id, len(records), issues_count,
+                        )
                         
                 except Exception as e:
-                    logger.warning(f"Failed to update document status: {e}")
+                    logger.warning("Failed to update document status: %s", e)
                     # Non-critical error
                 
-                logger.info(f"Atomic persistence completed successfully for deal {deal_id}")
+                logger.info("Atomic persistence completed successfully for deal %s", deal_id)
                 
             except Exception as e:
                 # Rollback the savepoint
                 savepoint.rollback()
-                logger.error(f"Persistence failed, rolling back: {e}")
+                logger.error("Persistence failed, rolling back: %s", e)
                 raise
             
             return True
             
         except Exception as e:
             self.session.rollback()
-            logger.error(f"Error persisting to database: {e}")
+            logger.error("Error persisting to database: %s", e)
             raise
     
     def _generate_unit_mix_summary(self, deal_id: int, normalized_records: List[Dict[str, Any]]) -> None:
         """Generate unit mix summary from normalized records."""
         try:
             # Clear existing unit mix data
-            existing_summary = self.session.query(UnitMixSummary).filter(
-                UnitMixSummary.deal_id == deal_id
-            ).all()
-            
-            for summary in existing_summary:
-                self.session.delete(summary)
+            self.session.execute(
+                delete(UnitMixSummary).where(UnitMixSummary.deal_id == deal_id)
+            )
             
             # Group by unit type
             unit_types = {}
@@ -1083,7 +1102,7 @@ class RentRollParser:
             
         except Exception as e:
             self.session.rollback()
-            logger.error(f"Error generating unit mix summary: {e}")
+            logger.error("Error generating unit mix summary: %s", e)
             raise
     
     def _safe_int(self, value: Any) -> Optional[int]:
@@ -1146,3 +1165,31 @@ class RentRollParser:
 def get_rentroll_parser(session: Session) -> RentRollParser:
     """Factory function to create RentRollParser instance."""
     return RentRollParser(session)
+
+
+def normalize_rentroll_document(session: Session, rentroll: DealDocument) -> Dict[str, Any]:
+    """Parse a stored rent roll document and persist it as the deal's NRR.
+
+    Marks the document completed on success. On failure the document is
+    marked failed with the error recorded, and the exception is re-raised.
+    """
+    try:
+        parser = get_rentroll_parser(session)
+        result = parser.parse_rentroll(rentroll.deal_id, rentroll.file_path)
+        parser.persist_to_database(rentroll.deal_id, result['normalized_data'])
+
+        rentroll.processing_status = "completed"
+        session.add(rentroll)
+        session.commit()
+    except Exception as e:
+        rentroll.processing_status = "failed"
+        rentroll.processing_error = str(e)
+        session.add(rentroll)
+        session.commit()
+        raise
+
+    return {
+        "records_processed": len(result['normalized_data']),
+        "issues_found": len(result['issues_report']),
+        "validation_passed": len(result['validation_report']['errors']) == 0,
+    }
@@ -1,12 +1,29 @@
 """Utility functions for DealBase."""
 
+import logging
 import re
 import unicodedata
+from functools import lru_cache
 from typing import Optional
+from fastapi import HTTPException
+from sqlalchemy import Float, cast, func
+from sqlalchemy.orm import InstrumentedAttribute
+from sqlalchemy.sql.elements import Label
 from sqlmodel import Session, select
 from .models import Deal
 
+logger = logging.getLogger(__name__)
 
+# Compiled once at import instead of on every slug generation
+_SLUG_STRIP_RE = re.compile(r'[^\w\s-]')
+_SLUG_SEPARATOR_RE = re.compile(r'[-\s]+')
+
+# Characters stripped from unit labels, which keep only [A-Z0-9-_]; shared by
+# the rent roll parser and normalizer
+UNIT_LABEL_INVALID_RE = re.compile(r'[^A-Z0-9\-_]')
+
+
+@lru_cache(maxsize=1024)
 def generate_slug(text: str) -> str:
     """Generate a URL-safe slug from text."""
     # Convert to lowercase
@@ -17,8 +34,8 @@ def generate_slug(text: str) -> str:
     text = ''.join(c for c in text if unicodedata.category(c) != 'Mn')
     
     # Replace spaces and special characters with hyphens
-    text = re.sub(r'[^\w\s-]', '', text)
-    text = re.sub(r'[-\s]+', '-', text)
+    text = _SLUG_STRIP_RE.sub('', text)
+    text = _SLUG_SEPARATOR_RE.sub('-', text)
     
     # Remove leading/trailing hyphens
     text = text.strip('-')
@@ -32,23 +49,24 @@ def generate_slug(text: str) -> str:
 
 def ensure_unique_slug(session: Session, base_slug: str, deal_id: Optional[int] = None) -> str:
     """Ensure the slug is unique by appending a number if needed."""
+    # Fetch every taken variant of the slug in one query instead of probing
+    # base, base-1, base-2, ... one round-trip at a time
+    query = select(Deal.slug).where(
+        (Deal.slug == base_slug) | Deal.slug.startswith(f"{base_slug}-", autoescape=True)
+    )
+    if deal_id:
+        query = query.where(Deal.id != deal_id)
+    
+    taken = set(session.exec(query).all())
+    
     slug = base_slug
     counter = 1
-    
-    while True:
-        # Check if slug exists (excluding current deal if updating)
-        query = select(Deal).where(Deal.slug == slug)
-        if deal_id:
-            query = query.where(Deal.id != deal_id)
-        
-        existing_deal = session.exec(query).first()
-        
-        if not existing_deal:
-            return slug
-        
+    while slug in taken:
         # Slug exists, try with counter
         slug = f"{base_slug}-{counter}"
         counter += 1
+    
+    return slug
 
 
 def create_deal_slug(session: Session, deal_name: str, deal_id: Optional[int] = None) -> str:
@@ -57,12 +75,28 @@ def create_deal_slug(session: Session, deal_name: str, deal_id: Optional[int] =
     return ensure_unique_slug(session, base_slug, deal_id)
 
 
+def assert_deal_exists(session: Session, deal_id: int) -> None:
+    """Raise a 404 unless the deal exists, checking its id without loading the row."""
+    if session.scalar(select(Deal.id).where(Deal.id == deal_id)) is None:
+        raise HTTPException(status_code=404, detail="Deal not found")
+
+
 def log_audit_event(deal_id: int, event_type: str, description: str, metadata: dict = None):
     """Log audit event for compliance tracking."""
-    from .models import AuditEvent
-    
     # This is a simplified version - in production, you'd want to inject the session
-    # For now, we'll just print the audit event
-    print(f"AUDIT EVENT: Deal {deal_id} - {event_type}: {description}")
+    # For now, we'll just log the audit event
+    logger.info("AUDIT EVENT: Deal %s - %s: %s", deal_id, event_type, description)
     if metadata:
-        print(f"  Metadata: {metadata}")
+        logger.info("  Metadata: %s", metadata)
+
+
+def as_float(column: InstrumentedAttribute, null_if_zero: bool = False) -> Label:
+    """Cast a money column to float in SQL, skipping per-cell Decimal round trips.
+
+    With ``null_if_zero`` a zero amount comes back as NULL, for optional
+    amounts the API reports as unset when they are zero.
+    """
+    value = cast(column, Float)
+    if null_if_zero:
+        value = func.nullif(value, 0)
+    return value.label(column.key)
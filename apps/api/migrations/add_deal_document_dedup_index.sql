@@ -0,0 +1,8 @@
+-- Migration: Composite index for the duplicate-upload check
+-- Rent roll intake looks up an existing document by deal_id, file_hash and
+-- file_type; this covers the whole predicate and replaces the single-column
+-- file_hash indexes.
+
+CREATE INDEX IF NOT EXISTS ix_deal_documents_dedup ON deal_documents(deal_id, file_hash, file_type);
+DROP INDEX IF EXISTS ix_deal_documents_file_hash;
+DROP INDEX IF EXISTS idx_deal_documents_file_hash;
@@ -0,0 +1,9 @@
+-- Migration: Composite indexes for per-deal document queries
+-- Document listings filter on deal_id (and usually file_type) and sort by
+-- created_at; these let SQLite range-scan the index instead of sorting.
+-- Both have deal_id as their leftmost column, so they replace the
+-- single-column deal_id index.
+
+CREATE INDEX IF NOT EXISTS ix_deal_documents_deal_type_created ON deal_documents(deal_id, file_type, created_at);
+CREATE INDEX IF NOT EXISTS ix_deal_documents_deal_created ON deal_documents(deal_id, created_at);
+DROP INDEX IF EXISTS ix_deal_documents_deal_id;
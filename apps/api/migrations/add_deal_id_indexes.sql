@@ -0,0 +1,15 @@
+-- Migration: Index deal_id foreign keys and deal slugs
+-- SQLite does not index foreign keys automatically, so every per-deal
+-- lookup (and delete_deal) scanned the child tables in full.
+
+CREATE INDEX IF NOT EXISTS ix_deals_slug ON deals(slug);
+
+CREATE INDEX IF NOT EXISTS ix_t12_normalized_deal_id ON t12_normalized(deal_id);
+CREATE INDEX IF NOT EXISTS ix_unit_mix_summary_deal_id ON unit_mix_summary(deal_id);
+CREATE INDEX IF NOT EXISTS ix_rent_roll_assumptions_deal_id ON rent_roll_assumptions(deal_id);
+CREATE INDEX IF NOT EXISTS ix_valuation_runs_deal_id ON valuation_runs(deal_id);
+CREATE INDEX IF NOT EXISTS ix_audit_events_deal_id ON audit_events(deal_id);
+
+-- Per-deal unit lookups and ordering by unit number; also serves plain
+-- deal_id filters on rent_roll_normalized as the leftmost prefix
+CREATE INDEX IF NOT EXISTS ix_rentroll_deal_unit ON rent_roll_normalized(deal_id, unit_number);
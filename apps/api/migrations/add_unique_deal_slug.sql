@@ -0,0 +1,7 @@
+-- Migration: Enforce unique deal slugs
+-- create_deal relies on the database to reject colliding slugs instead of
+-- probing for a free one before every insert. Resolve any existing
+-- duplicates (e.g. with migrate_add_slugs.py) before applying.
+
+DROP INDEX IF EXISTS ix_deals_slug;
+CREATE UNIQUE INDEX ix_deals_slug ON deals(slug);
@@ -2,49 +2,64 @@
 
 import pytest
 import io
+import hashlib
+import zipfile
 import pandas as pd
+from collections import OrderedDict
+from datetime import datetime
+from decimal import Decimal
+from pathlib import Path
+from sqlmodel import select
 
+from dealbase_api.models import DealDocument, RentRollAssumptions, RentRollNormalized, T12Normalized, UnitMixSummary
+from dealbase_api.routers import intake
+from dealbase_api.services.rentroll_parser import RentRollParser, get_rentroll_parser
 from test_utils import validate_api_response, create_test_csv_file, create_test_deal, assert_deal_matches
 
+# The shared test client is an httpx.AsyncClient over ASGITransport
+pytestmark = pytest.mark.asyncio
 
-def test_health_check(test_client):
+
+async def test_health_check(test_client):
     """Test health check endpoint."""
-    response = test_client.get("/api/health")
+    response = await test_client.get("/api/health")
     data = validate_api_response(response, 200, ["status", "timestamp", "version"])
     assert data["status"] == "healthy"
 
 
-def test_get_deals_empty(test_client):
+async def test_get_deals_empty(test_client):
     """Test getting deals when none exist."""
-    response = test_client.get("/api/deals")
+    response = await test_client.get("/api/deals")
     data = validate_api_response(response, 200)
     assert data == []
 
 
-def test_create_deal(test_client, sample_deal_data):
+async def test_create_deal(test_client, sample_deal_data):
     """Test creating a new deal."""
-    response = test_client.post("/api/deals", json=sample_deal_data)
+    response = await test_client.post("/api/deals", json=sample_deal_data)
     data = validate_api_response(response, 200, ["id", "name", "created_at"])
     assert_deal_matches(sample_deal_data, data)
 
 
-def test_get_deal_not_found(test_client):
+async def test_get_deal_not_found(test_client):
     """Test getting a non-existent deal."""
-    response = test_client.get("/api/deals/999")
+    response = await test_client.get("/api/deals/999")
     validate_api_response(response, 404)
+    for path in ("/api/deals/999/unit-mix", "/api/deals/999/rentroll-assumptions", "/api/valuation/runs/999"):
+        assert validate_api_response(await test_client.get(path), 404)["detail"] == "Deal not found"
 
 
-def test_intake_t12_preview(test_client, sample_deal_data, sample_t12_data):
+async def test_intake_t12_preview(test_client, sample_deal_data, sample_t12_data, csv_engine):
     """Test T-12 intake preview functionality."""
     # Create a deal
-    deal_response = test_client.post("/api/deals", json=sample_deal_data)
+    deal_response = await test_client.post("/api/deals", json=sample_deal_data)
     deal_data = validate_api_response(deal_response, 200, ["id"])
     deal_id = deal_data["id"]
     
     # Test T-12 intake with sample data
     csv_file = create_test_csv_file(sample_t12_data, "test_t12.csv")
     
-    response = test_client.post(
+    response = await test_client.post(
         f"/api/intake/t12/{deal_id}",
         files={"file": csv_file}
     )
@@ -52,17 +67,498 @@ def test_intake_t12_preview(test_client, sample_deal_data, sample_t12_data):
     data = validate_api_response(response, 200, ["success", "preview_data", "mapping_report"])
     assert data["success"] is True
     assert len(data["preview_data"]) > 0
+    assert data["preview_data"][0]["gross_rent"] == sample_t12_data["gross_rent"][0]
+    assert data["mapping_report"]["date_range"] == "2023-2023"
+    data_quality = data["mapping_report"]["data_quality"]
+    assert data_quality["negative_noi_months"] == 0
+    assert data_quality["missing_values"]["gross_rent"] == 0
+
+
+async def test_intake_t12_reupload_replaces_rows(test_client, test_session, sample_deal_data, sample_t12_data, csv_engine):
+    """Test re-uploading a T-12 replaces the deal's rows instead of appending."""
+    deal_id = (await create_test_deal(test_client, sample_deal_data))["id"]
+    for _ in range(2):
+        csv_file = create_test_csv_file(sample_t12_data, "test_t12.csv")
+        validate_api_response(await test_client.post(f"/api/intake/t12/{deal_id}", files={"file": csv_file}))
+
+    rows = test_session.exec(
+        select(T12Normalized).where(T12Normalized.deal_id == deal_id).order_by(T12Normalized.month)
+    ).all()
+    assert len(rows) == len(sample_t12_data["month"])
+    assert all(row.created_at is not None for row in rows)
+
+    # Bulk-inserted amounts carry the derived columns; a missing other_income counts as zero
+    assert [row.month for row in rows] == sample_t12_data["month"]
+    assert all(row.other_income == 0 for row in rows)
+    assert [float(row.net_operating_income) for row in rows] == [
+        gross - opex
+        for gross, opex in zip(sample_t12_data["gross_rent"], sample_t12_data["operating_expenses"])
+    ]
+
+
+async def test_intake_t12_rejects_non_utf8_csv(test_client, sample_deal_data, sample_t12_data, csv_engine):
+    """Test a CSV that is not valid UTF-8 is rejected whichever CSV engine is in use."""
+    deal_id = (await create_test_deal(test_client, sample_deal_data))["id"]
+    content = pd.DataFrame({**sample_t12_data, "notes": ["Café"] * 6}).to_csv(index=False).encode("latin-1")
+
+    response = await test_client.post(
+        f"/api/intake/t12/{deal_id}", files={"file": ("test_t12.csv", io.BytesIO(content), "text/csv")}
+    )
+    validate_api_response(response, 400)
+
+
+async def test_intake_t12_excel_detects_header_row(test_client, sample_deal_data, sample_t12_data):
+    """Test T-12 Excel intake skips title rows above the column headers."""
+    deal_id = (await create_test_deal(test_client, sample_deal_data))["id"]
+
+    buffer = io.BytesIO()
+    with pd.ExcelWriter(buffer, engine="openpyxl") as writer:
+        pd.DataFrame([["Trailing 12 Report"]]).to_excel(writer, index=False, header=False)
+        pd.DataFrame(sample_t12_data).to_excel(writer, index=False, startrow=2)
+    xlsx_file = (
+        "test_t12.xlsx",
+        buffer.getvalue(),
+        "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    )
+
+    response = await test_client.post(f"/api/intake/t12/{deal_id}", files={"file": xlsx_file})
+    data = validate_api_response(response, 200, ["success", "mapping_report"])
+    assert data["success"] is True
+    assert data["mapping_report"]["total_rows"] == len(sample_t12_data["month"])
+
+
+async def test_upload_rentroll_hashes_streamed_file(test_client, test_session, sample_deal_data):
+    """Test rent roll uploads record the streamed file's hash and skip exact duplicates."""
+    deal_id = (await create_test_deal(test_client, sample_deal_data))["id"]
+    content = (
+        b"Unit,Unit Type,Sq Ft,Rent,Market Rent,Status\n"
+        b"101,1BR,700,1200,1250,Occupied\n"
+        b"102,2BR,900,1500,1550,Vacant\n"
+    )
+    url = f"/api/intake/rentroll/{deal_id}"
+
+    document = None
+    try:
+        first = validate_api_response(
+            await test_client.post(url, files={"file": ("rr.csv", content, "text/csv")}), 200
+        )
+        document = test_session.get(DealDocument, first["document_id"])
+        assert document.file_size == len(content)
+        assert document.file_hash == hashlib.blake2b(content, digest_size=16).hexdigest()
+        assert Path(document.file_path).read_bytes() == content
+        units = test_session.exec(select(RentRollNormalized).where(RentRollNormalized.deal_id == deal_id)).all()
+        assert sorted(unit.unit_number for unit in units) == ["101", "102"]
+        preview = validate_api_response(await test_client.get(f"/api/intake/rentroll/{deal_id}/preview"), 200)
+        assert preview["file_info"]["total_rows"] == 2
+
+        second = validate_api_response(
+            await test_client.post(url, files={"file": ("rr.csv", content, "text/csv")}), 200
+        )
+        assert second["document_id"] == first["document_id"]
+        assert second["processing_summary"] == {"duplicate_upload": True}
+        assert Path(document.file_path).read_bytes() == content
+    finally:
+        if document is not None:
+            Path(document.file_path).unlink(missing_ok=True)
+
+
+async def test_upload_rentroll_fails_unparseable_file_without_retrying(test_client, test_session, sample_deal_data, monkeypatch):
+    """Test a rent roll the parser rejects is marked failed on the first attempt."""
+    # Every retry backs off via _retry_delay, so no calls means no retries
+    retry_attempts = []
+    monkeypatch.setattr(intake, "_retry_delay", lambda attempt: retry_attempts.append(attempt) or 0)
+
+    deal_id = (await create_test_deal(test_client, sample_deal_data))["id"]
+    response = await test_client.post(
+        f"/api/intake/rentroll/{deal_id}", files={"file": ("rr.csv", b"foo,bar\n1,2\n", "text/csv")}
+    )
+
+    document = test_session.exec(select(DealDocument).where(DealDocument.deal_id == deal_id)).one()
+    Path(document.file_path).unlink(missing_ok=True)
+    validate_api_response(response, 500)
+    assert document.processing_status == "failed"
+    assert retry_attempts == []
+
+
+async def test_upload_rentroll_retries_transient_read_error(test_client, test_session, sample_deal_data, monkeypatch):
+    """Test an I/O error while parsing a rent roll is retried once after the first backoff."""
+    retry_attempts = []
+    monkeypatch.setattr(intake, "_retry_delay", lambda attempt: retry_attempts.append(attempt) or 0)
+    read_file = RentRollParser._read_file
+    failures = [OSError("transient read failure")]
 
+    def flaky_read_file(self, *args, **kwargs):
+        if failures:
+            raise failures.pop()
+        return read_file(self, *args, **kwargs)
 
-def test_valuation_run_returns_result_bundle_shape(test_client, sample_deal_data, sample_valuation_request):
+    monkeypatch.setattr(RentRollParser, "_read_file", flaky_read_file)
+
+    deal_id = (await create_test_deal(test_client, sample_deal_data))["id"]
+    content = b"Unit,Unit Type,Sq Ft,Rent,Market Rent\n101,1BR,700,1200,1250\n"
+    response = await test_client.post(
+        f"/api/intake/rentroll/{deal_id}", files={"file": ("rr.csv", content, "text/csv")}
+    )
+
+    document = test_session.exec(select(DealDocument).where(DealDocument.deal_id == deal_id)).one()
+    Path(document.file_path).unlink(missing_ok=True)
+    data = validate_api_response(response, 200)
+    assert data["retry_info"]["processing_retries"] == 1
+    assert retry_attempts == [0]
+    assert document.processing_status == "completed"
+
+
+async def test_rentroll_parser_infers_unit_type_and_status(test_session):
+    """Test the parser derives unit types from bedrooms and occupancy from tenant names."""
+    content = (
+        b"Unit,Beds,Sq Ft,Rent,Tenant\n"
+        b"101,1,700,1200,Smith\n"
+        b"102,0,450,900,VACANT\n"
+        b"103,2,900,1500,\n"
+        b"104,7,1500,2000,Jones\n"
+    )
+    result = get_rentroll_parser(test_session).parse_rentroll(1, "rr.csv", content)
+
+    units = [(unit["unit_number"], unit["unit_type"], unit["lease_status"]) for unit in result["normalized_data"]]
+    assert units == [
+        ("101", "1BR", "occupied"),
+        ("102", "Studio", "vacant"),
+        ("103", "2BR", "vacant"),
+        ("104", "Studio", "occupied"),
+    ]
+
+
+async def test_preview_rentroll_raw_reads_head_and_counts_rows(test_client, test_session, sample_deal_data, tmp_path):
+    """Test the raw rent roll preview returns the first rows but counts them all."""
+    deal_id = (await create_test_deal(test_client, sample_deal_data))["id"]
+    file_path = tmp_path / "rent_roll.xlsx"
+    units = pd.DataFrame({"Unit": [100 + i for i in range(25)], "Rent": [1000.0] * 24 + [float("nan")]})
+    units.to_excel(file_path, index=False)
+    test_session.add(DealDocument(
+        deal_id=deal_id, filename=file_path.name, original_filename=file_path.name, file_type="rent_roll",
+        file_size=file_path.stat().st_size, content_type="application/octet-stream", file_path=str(file_path),
+    ))
+    test_session.commit()
+
+    data = validate_api_response(await test_client.get(f"/api/intake/rentroll/{deal_id}/preview"), 200)
+    assert data["success"] is True
+    assert data["file_info"]["total_rows"] == 25
+    assert data["file_info"]["columns"] == ["Unit", "Rent"]
+    assert len(data["preview_data"]) == data["file_info"]["preview_rows"] == 20
+    assert data["preview_data"][0] == {"Unit": 100, "Rent": 1000.0}
+
+
+async def test_parsed_upload_cache_stays_within_byte_budget(monkeypatch):
+    """Test the parsed upload cache evicts by memory size and skips frames over budget."""
+    small = pd.DataFrame({"a": range(100)})
+    small_bytes = int(small.memory_usage(deep=True).sum())
+    monkeypatch.setattr(intake, "_parsed_upload_cache", OrderedDict())
+    monkeypatch.setattr(intake, "_parsed_upload_cache_bytes", 0)
+    monkeypatch.setattr(intake, "PARSED_UPLOAD_CACHE_BYTES", small_bytes * 3 // 2)
+
+    intake._cache_parsed_upload(("first", ".csv", 3), small)
+    intake._cache_parsed_upload(("second", ".csv", 3), small.copy())
+    assert list(intake._parsed_upload_cache) == [("second", ".csv", 3)]
+    assert intake._parsed_upload_cache_bytes == small_bytes
+
+    intake._cache_parsed_upload(("large", ".csv", 3), pd.DataFrame({"a": range(1000)}))
+    assert list(intake._parsed_upload_cache) == [("second", ".csv", 3)]
+
+
+async def test_read_csv_head_stops_at_requested_rows(tmp_path, csv_engine):
+    """Test the CSV head read returns only the requested rows of a multi-block file."""
+    file_path = tmp_path / "rent_roll.csv"
+    file_path.write_text("Unit,Tenant\n" + "".join(f"{i},Tenant {i}\n" for i in range(200_000)))
+
+    df = intake._read_csv_head(str(file_path), 20)
+    assert list(df.columns) == ["Unit", "Tenant"]
+    assert df["Unit"].tolist() == list(range(20))
+
+
+async def test_read_csv_head_matches_pandas_nulls_and_rejects_non_utf8(tmp_path, csv_engine):
+    """Test the CSV head read gives pandas' nulls and refuses text that is not UTF-8."""
+    file_path = tmp_path / "rent_roll.csv"
+    file_path.write_text("Unit,Rent,Tenant\n101,1200,Smith\n102,,\n\n103,1300,NA\n")
+
+    df = intake._read_csv_head(str(file_path), 20)
+    assert df["Unit"].tolist() == [101, 102, 103]
+    assert df["Rent"].isna().tolist() == [False, True, False]
+    assert df["Tenant"].isna().tolist() == [False, True, True]
+
+    file_path.write_bytes("Unit,Tenant\n101,Café\n".encode("latin-1"))
+    with pytest.raises(ValueError):
+        intake._read_csv_head(str(file_path), 20)
+
+
+async def test_preview_rentroll_csv_with_dates(test_client, sample_deal_data, csv_engine):
+    """Test a rent roll CSV with date columns previews the same under either CSV engine."""
+    deal_id = (await create_test_deal(test_client, sample_deal_data))["id"]
+    content = (
+        b"Unit,Unit Type,Sq Ft,Rent,Market Rent,Lease Start,Lease End,Tenant\n"
+        b"101,1BR,700,1200,1250,2024-01-01,2024-12-31,Smith\n"
+        b"102,2BR,900,1500,1550,2023-06-15,2024-06-14,Jones\n"
+    )
+    response = await test_client.post(
+        f"/api/intake/rentroll/preview/{deal_id}", files={"file": ("rr.csv", content, "text/csv")}
+    )
+    data = validate_api_response(response, 200, ["success", "preview_data"])
+    assert data["success"] is True
+    first = data["preview_data"][0]
+    assert (first["unit_number"], first["actual_rent"]) == ("101", 1200)
+    assert first["lease_start"] == "2024-01-01T00:00:00"
+    assert len(data["preview_data"]) == 2
+
+
+async def test_commit_rentroll_replaces_units(test_client, test_session, sample_deal_data):
+    """Test committing normalized rent roll rows replaces the deal's units."""
+    deal_id = (await create_test_deal(test_client, sample_deal_data))["id"]
+    url = f"/api/intake/rentroll/commit/{deal_id}"
+    units = [
+        {"unit_number": "101", "unit_type": "1BR", "square_feet": 700.0, "bathrooms": 1,
+         "actual_rent": 1200, "market_rent": 1250, "lease_start": "2024-01-01"},
+        {"unit_number": "102", "unit_type": "2BR", "square_feet": None, "bathrooms": 42,
+         "actual_rent": 1500, "market_rent": 1550, "lease_status": "vacant"},
+    ]
+    for payload in (units[:1], units):
+        data = validate_api_response(await test_client.post(url, json={"normalized_data": payload}), 200)
+        assert data["units_committed"] == len(payload)
+
+    rows = test_session.exec(
+        select(RentRollNormalized).where(RentRollNormalized.deal_id == deal_id).order_by(RentRollNormalized.unit_number)
+    ).all()
+    assert [row.unit_number for row in rows] == ["101", "102"]
+    assert rows[0].square_feet == 700
+    assert rows[0].lease_start.year == 2024
+    assert rows[1].bathrooms is None
+    assert rows[1].lease_status == "vacant"
+    assert all(row.created_at is not None for row in rows)
+
+
+async def test_valuation_run_returns_result_bundle_shape(test_client, sample_deal_data, sample_valuation_request):
     """Test that valuation run returns proper ResultBundle shape."""
     # Create a deal
-    deal_response = test_client.post("/api/deals", json=sample_deal_data)
+    deal_response = await test_client.post("/api/deals", json=sample_deal_data)
     deal_data = validate_api_response(deal_response, 200, ["id"])
     deal_id = deal_data["id"]
     
     # Test valuation request
-    response = test_client.post(f"/api/valuation/run/{deal_id}", json=sample_valuation_request)
+    response = await test_client.post(f"/api/valuation/run/{deal_id}", json=sample_valuation_request)
     
     # This should fail due to missing T-12 data, but we can verify the error handling
     assert response.status_code in [400, 422]  # Bad request due to missing data
+
+
+async def test_delete_deal_removes_related_rows(test_client, test_session, sample_deal_data, sample_t12_data):
+    """Test deleting a deal also deletes its T-12 rows and assumptions."""
+    deal_id = (await create_test_deal(test_client, sample_deal_data))["id"]
+    csv_file = create_test_csv_file(sample_t12_data, "test_t12.csv")
+    validate_api_response(await test_client.post(f"/api/intake/t12/{deal_id}", files={"file": csv_file}))
+    validate_api_response(await test_client.get(f"/api/deals/{deal_id}/rentroll-assumptions"))
+
+    response = await test_client.delete(f"/api/deals/{deal_id}")
+    data = validate_api_response(response, 200, ["id"])
+    assert data["id"] == deal_id
+
+    for model in (T12Normalized, RentRollAssumptions):
+        assert test_session.exec(select(model).where(model.deal_id == deal_id)).all() == []
+    validate_api_response(await test_client.get(f"/api/deals/{deal_id}"), 404)
+
+
+async def test_create_deal_deduplicates_generated_slugs(test_client, sample_deal_data):
+    """Test colliding generated slugs get a suffix and explicit ones conflict."""
+    first = await create_test_deal(test_client, sample_deal_data)
+    second = await create_test_deal(test_client, sample_deal_data)
+    assert first["slug"] == "test-office-building"
+    assert second["slug"] == "test-office-building-1"
+
+    response = await test_client.post("/api/deals", json={**sample_deal_data, "slug": first["slug"]})
+    validate_api_response(response, 409)
+
+
+async def test_export_deal_xlsx(test_client, sample_deal_data, sample_t12_data):
+    """Test exporting a deal with T-12 data streams a valid workbook."""
+    deal_id = (await create_test_deal(test_client, sample_deal_data))["id"]
+    csv_file = create_test_csv_file(sample_t12_data, "test_t12.csv")
+    validate_api_response(await test_client.post(f"/api/intake/t12/{deal_id}", files={"file": csv_file}))
+
+    response = await test_client.get(f"/api/export/xlsx/{deal_id}")
+    assert response.status_code == 200
+    with zipfile.ZipFile(io.BytesIO(response.content)) as workbook:
+        assert "xl/worksheets/sheet2.xml" in workbook.namelist()
+
+
+async def test_get_deals_paginates(test_client, sample_deal_data):
+    """Test the deal list honours limit/offset, reports the total and is whole when unpaged."""
+    created = [await create_test_deal(test_client, sample_deal_data) for _ in range(3)]
+
+    response = await test_client.get("/api/deals", params={"limit": 2, "offset": 1})
+    data = validate_api_response(response, 200)
+    assert [deal["id"] for deal in data] == [deal["id"] for deal in created[1:]]
+    assert response.headers["X-Total-Count"] == "3"
+
+    # Without a limit the whole list comes back, however long it is
+    response = await test_client.get("/api/deals")
+    data = validate_api_response(response, 200)
+    assert [deal["id"] for deal in data] == [deal["id"] for deal in created]
+
+
+async def test_normalized_rentroll_reports_latest_document(test_client, test_session, sample_deal_data):
+    """Test the rent roll renders rents as floats and, with its summary, names the latest rent roll."""
+    deal_id = (await create_test_deal(test_client, sample_deal_data))["id"]
+    for filename, created_at in (("old.csv", datetime(2020, 1, 1)), ("new.csv", datetime(2024, 1, 1))):
+        test_session.add(DealDocument(
+            deal_id=deal_id, filename=filename, original_filename=filename, file_type="rent_roll",
+            file_size=1, content_type="text/csv", file_path=filename,
+            processing_status="completed", created_at=created_at,
+        ))
+    for unit_number, market_rent in (("102", Decimal("0")), ("101", Decimal("1100.25"))):
+        test_session.add(RentRollNormalized(
+            deal_id=deal_id, unit_number=unit_number, unit_type="1BR",
+            actual_rent=Decimal("1000.50"), market_rent=market_rent,
+        ))
+    test_session.commit()
+
+    url = f"/api/deals/{deal_id}/rentroll/normalized"
+    data = validate_api_response(await test_client.get(url), 200)
+    assert [unit["unit_number"] for unit in data["data"]] == ["101", "102"]
+    assert [(unit["actual_rent"], unit["market_rent"]) for unit in data["data"]] == [(1000.5, 1100.25), (1000.5, None)]
+    assert data["rent_roll_name"] == "new.csv"
+
+    summary = validate_api_response(await test_client.get(url, params={"summary": True}), 200)
+    assert summary["data"] == []
+    assert summary["total_count"] == 2
+    assert summary["rent_roll_name"] == "new.csv"
+
+    documents = validate_api_response(await test_client.get(f"/api/deals/{deal_id}/documents"), 200)
+    assert [doc["original_filename"] for doc in documents] == ["new.csv", "old.csv"]
+    assert documents[0]["created_at"] == "2024-01-01T00:00:00"
+
+
+async def test_get_rentroll_data_serializes_and_pages_units(test_client, test_session, sample_deal_data):
+    """Test the rent roll endpoint's JSON rendering and optional paging."""
+    deal_id = (await create_test_deal(test_client, sample_deal_data))["id"]
+    test_session.add(RentRollNormalized(
+        deal_id=deal_id, unit_number="101", unit_type="1BR", actual_rent=Decimal("1250.50"),
+        lease_start=datetime(2024, 3, 1),
+    ))
+    test_session.add(RentRollNormalized(deal_id=deal_id, unit_number="102", unit_type="1BR"))
+    test_session.commit()
+
+    url = f"/api/deals/{deal_id}/rentroll"
+    data = validate_api_response(await test_client.get(url), 200, ["units"])
+    assert data["total_units"] == 2
+    unit = data["units"][0]
+    assert unit["actual_rent"] == 1250.5
+    assert unit["lease_start"] == "2024-03-01T00:00:00"
+    assert unit["lease_expiration"] is None
+
+    response = await test_client.get(url, params={"limit": 1, "offset": 1})
+    page = validate_api_response(response, 200, ["units"])
+    assert [unit["unit_number"] for unit in page["units"]] == ["102"]
+    assert page["total_units"] == 2
+    assert response.headers["X-Total-Count"] == "2"
+
+
+async def test_update_rentroll_assumptions(test_client, sample_deal_data):
+    """Test assumption updates convert each supplied field and leave the rest alone."""
+    deal_id = (await create_test_deal(test_client, sample_deal_data))["id"]
+    url = f"/api/deals/{deal_id}/rentroll-assumptions"
+    defaults = validate_api_response(await test_client.get(url), 200)
+
+    response = await test_client.post(url, json={"vacancy_rate": 0.07, "avg_lease_term": "18"})
+    assumptions = validate_api_response(response, 200, ["assumptions"])["assumptions"]
+    assert assumptions["vacancy_rate"] == 0.07
+    assert assumptions["avg_lease_term"] == 18
+    assert assumptions["turnover_rate"] == defaults["turnover_rate"]
+    assert assumptions.keys() == defaults.keys()
+
+
+async def test_get_unit_mix_totals(test_client, sample_deal_data):
+    """Test the unit type view totals every saved unit mix row."""
+    deal_id = (await create_test_deal(test_client, sample_deal_data))["id"]
+    rows = [
+        {"unit_type": "1BR", "total_units": 10, "occupied_units": 9, "avg_square_feet": 700,
+         "avg_actual_rent": "1000", "avg_market_rent": "1100"},
+        {"unit_type": "2BR", "total_units": 5, "occupied_units": 5, "avg_square_feet": 1000,
+         "avg_actual_rent": "1500", "avg_market_rent": "1500"},
+    ]
+    validate_api_response(await test_client.put(f"/api/deals/{deal_id}/unit-mix", json=rows), 200)
+
+    response = await test_client.get(f"/api/deals/{deal_id}/unit-mix", params={"group_by": "unit_type"})
+    data = validate_api_response(response, 200, ["unit_mix", "totals"])
+    assert [row["unit_type"] for row in data["unit_mix"]] == ["1BR", "2BR"]
+    one_bed = data["unit_mix"][0]
+    assert (one_bed["avg_actual_rent"], one_bed["rent_premium"], one_bed["total_actual_rent"]) == (1000.0, -100.0, 10000.0)
+    assert one_bed["pro_forma_rent"] is None and one_bed["unit_label"] is None
+    totals = data["totals"]
+    assert totals["total_units"] == 15
+    assert totals["total_occupied"] == 14
+    assert totals["total_actual_rent"] == sum(row["total_actual_rent"] for row in data["unit_mix"])
+    assert totals["total_square_feet"] == sum(row["total_square_feet"] or 0 for row in data["unit_mix"])
+
+
+async def test_derive_unit_mix_aggregates_by_unit_type(test_client, test_session, sample_deal_data):
+    """Test deriving the unit mix averages each unit type and skips zero rents."""
+    deal_id = (await create_test_deal(test_client, sample_deal_data))["id"]
+    units = [
+        {"unit_number": "101", "unit_type": "1BR", "unit_label": "A1", "square_feet": 700, "bedrooms": 1,
+         "actual_rent": 1200, "market_rent": 1300},
+        {"unit_number": "102", "unit_type": "1BR", "unit_label": "A2", "square_feet": None, "bedrooms": 1,
+         "actual_rent": 0, "market_rent": 1100, "lease_status": "Vacant"},
+        {"unit_number": "201", "unit_type": "2BR", "square_feet": 1001, "bedrooms": 2,
+         "actual_rent": 1500, "market_rent": 0},
+    ]
+    url = f"/api/intake/rentroll/commit/{deal_id}"
+    validate_api_response(await test_client.post(url, json={"normalized_data": units}), 200)
+    validate_api_response(await test_client.post(f"/api/deals/{deal_id}/unit-mix/derive"), 200)
+
+    rows = test_session.exec(
+        select(UnitMixSummary).where(UnitMixSummary.deal_id == deal_id).order_by(UnitMixSummary.unit_type)
+    ).all()
+    one_bed, two_bed = rows
+    assert (one_bed.unit_label, one_bed.total_units, one_bed.occupied_units) == ("A1", 2, 1)
+    assert (one_bed.avg_square_feet, one_bed.total_square_feet, one_bed.avg_bedrooms) == (700, 700, 1.0)
+    assert float(one_bed.avg_actual_rent) == 1200
+    assert float(one_bed.avg_market_rent) == 1200
+    assert float(one_bed.total_actual_rent) == 2400
+    assert two_bed.unit_label is None
+    assert float(two_bed.avg_market_rent) == 0
+    assert float(two_bed.rent_premium) == 0
+
+    validate_api_response(await test_client.post(f"/api/deals/{deal_id}/unit-mix/unlink"), 200)
+    links = test_session.exec(
+        select(UnitMixSummary.provenance, UnitMixSummary.is_linked_to_nrr).where(UnitMixSummary.deal_id == deal_id)
+    ).all()
+    assert set(links) == {("MANUAL", False)}
+
+
+async def test_deal_routes_accept_id_or_slug(test_client, sample_deal_data):
+    """Test numeric paths resolve by ID and everything else by slug."""
+    deal = await create_test_deal(test_client, sample_deal_data)
+
+    by_id = validate_api_response(await test_client.get(f"/api/deals/{deal['id']}"), 200)
+    by_slug = validate_api_response(await test_client.get(f"/api/deals/{deal['slug']}"), 200)
+    assert by_id == by_slug == deal
+
+    validate_api_response(await test_client.get("/api/deals/no-such-deal"), 404)
+    data = validate_api_response(await test_client.delete(f"/api/deals/{deal['slug']}"), 200, ["id"])
+    assert data["id"] == deal["id"]
+    validate_api_response(await test_client.get(f"/api/deals/{deal['id']}"), 404)
+
+
+async def test_deal_endpoints_honour_if_none_match(test_client, sample_deal_data):
+    """Test unchanged deals and deal lists answer 304 to a matching ETag."""
+    deal = await create_test_deal(test_client, sample_deal_data)
+
+    for url in (f"/api/deals/{deal['id']}", f"/api/deals/{deal['slug']}", "/api/deals"):
+        response = await test_client.get(url)
+        etag = response.headers["ETag"]
+        cached = await test_client.get(url, headers={"If-None-Match": etag})
+        assert cached.status_code == 304
+        assert cached.content == b""
+
+    list_etag = (await test_client.get("/api/deals")).headers["ETag"]
+    await create_test_deal(test_client, sample_deal_data)
+    response = await test_client.get("/api/deals", headers={"If-None-Match": list_etag})
+    assert response.status_code == 200
+    assert len(response.json()) == 2
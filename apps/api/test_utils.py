@@ -2,7 +2,7 @@
 
 import io
 import pandas as pd
-from fastapi.testclient import TestClient
+import httpx
 from typing import Dict, Any, Optional
 
 
@@ -35,9 +35,9 @@ def create_test_csv_file(data: Dict[str, list], filename: str = "test.csv") -> t
     )
 
 
-def create_test_deal(client: TestClient, deal_data: Dict[str, Any]) -> Dict[str, Any]:
+async def create_test_deal(client: httpx.AsyncClient, deal_data: Dict[str, Any]) -> Dict[str, Any]:
     """Helper to create a test deal and return the response data."""
-    response = client.post("/api/deals", json=deal_data)
+    response = await client.post("/api/deals", json=deal_data)
     validate_api_response(response, 200, ["id", "name", "created_at"])
     return response.json()
 